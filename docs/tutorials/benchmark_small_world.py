@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Small-World Metrics
+
+Times the graph-metrics hot paths in small_world_metrics.py across graph
+sizes and degrees, records wall time, peak RSS and edges/sec to a JSON
+history file, and flags regressions against a stored baseline.
+Part of the thermodynamic-economics skill for Univrs.io.
+
+Usage:
+    python benchmark_small_world.py
+    python benchmark_small_world.py --sizes 1000,10000 --degrees 6,10 --cases clustering,path_length
+    python benchmark_small_world.py --save-baseline bench_baseline.json
+    python benchmark_small_world.py --baseline bench_baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import small_world_metrics as swm
+
+CASES = ('watts_strogatz', 'erdos_renyi', 'load_edgelist', 'clustering',
+         'path_length', 'small_world_metrics')
+
+# Above this many nodes, path length is estimated from sampled pivots
+EXACT_PATH_LIMIT = 5000
+PATH_SAMPLES = 64
+
+
+def _peak_rss_reset() -> bool:
+    """Reset the kernel's peak-RSS counter for this process (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _setup_case(case: str, n: int, k: int, options: Dict) -> Tuple[Callable, int]:
+    """Prepare inputs outside the timed region; returns (timed call, edges)."""
+    m = n * (k // 2)
+    compact = options['compact']
+
+    if case == 'watts_strogatz':
+        return lambda: swm.watts_strogatz(n, k, 0.1, seed=1), m
+    if case == 'erdos_renyi':
+        return lambda: swm.erdos_renyi(n, m, seed=1, compact=compact), m
+
+    g = swm.watts_strogatz(n, k, 0.1, seed=1)
+    if compact:
+        g = g.freeze()
+
+    if case == 'load_edgelist':
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            for u, v in g.edges():
+                f.write(f"{u},{v}\n")
+        options['cleanup'] = path
+        return lambda: swm.load_edgelist(path), m
+    if case == 'clustering':
+        return lambda: swm.clustering_coefficient(g), m
+
+    samples = PATH_SAMPLES if n > options['exact_limit'] else None
+    if case == 'path_length':
+        return lambda: swm.average_path_length(g, samples=samples, seed=1,
+                                               engine=options['engine']), m
+    if case == 'small_world_metrics':
+        return lambda: swm.small_world_metrics(g, approximate=samples is not None,
+                                               samples=samples, seed=1,
+                                               engine=options['engine']), m
+    raise ValueError(f"Unknown benchmark case {case!r}")
+
+
+def _run_case(case: str, n: int, k: int, options: Dict, repeat: int) -> Dict:
+    """Run one case in this (child) process and measure it."""
+    options = dict(options)
+    call, m = _setup_case(case, n, k, options)
+    try:
+        best = float('inf')
+        exact_peak = _peak_rss_reset()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            best = min(best, time.perf_counter() - started)
+        peak = _peak_rss_mb()
+    finally:
+        if 'cleanup' in options:
+            os.remove(options['cleanup'])
+
+    return {
+        'case': case,
+        'n': n,
+        'k': k,
+        'edges': m,
+        'seconds': best,
+        'peak_rss_mb': peak,
+        'peak_rss_includes_setup': not exact_peak,
+        'edges_per_sec': m / best if best > 0 else float('inf'),
+        'sampled_paths': case in ('path_length', 'small_world_metrics') and n > options['exact_limit'],
+    }
+
+
+def run_case_isolated(case: str, n: int, k: int, options: Dict, repeat: int = 1) -> Dict:
+    """Run a case in a fresh process so its peak RSS is not polluted by others."""
+    ctx = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    with ctx.Pool(1) as pool:
+        return pool.apply(_run_case, (case, n, k, options, repeat))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__) or '.').stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def scaling_exponents(results: List[Dict]) -> Dict[str, float]:
+    """Least-squares slope of log(seconds) vs log(n) per (case, k) series."""
+    series: Dict[Tuple[str, int], List[Tuple[float, float]]] = {}
+    for r in results:
+        if r['seconds'] > 0 and not r['sampled_paths']:
+            series.setdefault((r['case'], r['k']), []).append((math.log(r['n']), math.log(r['seconds'])))
+
+    exponents = {}
+    for (case, k), points in sorted(series.items()):
+        if len(points) < 2:
+            continue
+        mx = sum(x for x, _ in points) / len(points)
+        my = sum(y for _, y in points) / len(points)
+        sxx = sum((x - mx) ** 2 for x, _ in points)
+        if sxx > 0:
+            exponents[f"{case}/k={k}"] = sum((x - mx) * (y - my) for x, y in points) / sxx
+    return exponents
+
+
+def _latest_run(path: str) -> Dict:
+    with open(path) as f:
+        data = json.load(f)
+    return data['runs'][-1] if 'runs' in data else data
+
+
+def find_regressions(run: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Cases whose time or peak RSS grew by more than `threshold` (fraction)."""
+    reference = {(r['case'], r['n'], r['k']): r for r in baseline['results']}
+    regressions = []
+    for r in run['results']:
+        ref = reference.get((r['case'], r['n'], r['k']))
+        if ref is None:
+            continue
+        for metric in ('seconds', 'peak_rss_mb'):
+            if ref[metric] > 0 and r[metric] > ref[metric] * (1 + threshold):
+                regressions.append({'case': r['case'], 'n': r['n'], 'k': r['k'],
+                                    'metric': metric, 'baseline': ref[metric],
+                                    'current': r[metric], 'ratio': r[metric] / ref[metric]})
+    return regressions
+
+
+def append_history(path: str, run: Dict):
+    history = {'runs': []}
+    if os.path.exists(path):
+        with open(path) as f:
+            history = json.load(f)
+    history['runs'].append(run)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Small-World Metrics Benchmark Suite')
+    parser.add_argument('--sizes', type=str, default='1000,10000,100000,1000000',
+                        help='Comma-separated node counts')
+    parser.add_argument('--degrees', type=str, default='6,10,20',
+                        help='Comma-separated average degrees')
+    parser.add_argument('--cases', type=str, default=','.join(CASES),
+                        help=f"Comma-separated cases from: {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per case; the fastest is kept')
+    parser.add_argument('--engine', choices=swm.HOP_ENGINES, default='bfs',
+                        help='Hop-count path-length engine')
+    parser.add_argument('--exact-limit', type=int, default=EXACT_PATH_LIMIT,
+                        help='Largest N for exact all-pairs path length; above it pivots are sampled')
+    parser.add_argument('--no-compact', action='store_true',
+                        help='Benchmark the set-based Graph instead of CompactGraph')
+    parser.add_argument('--history', type=str, default='bench_history.json',
+                        help='JSON file that accumulates benchmark runs')
+    parser.add_argument('--baseline', type=str, help='Baseline file to compare against')
+    parser.add_argument('--save-baseline', type=str, help='Write this run as a baseline file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative slowdown or memory growth flagged as a regression')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+
+    args = parser.parse_args()
+
+    cases = [c for c in args.cases.split(',') if c]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    sizes = [int(float(x)) for x in args.sizes.split(',') if x]
+    degrees = [int(x) for x in args.degrees.split(',') if x]
+    options = {'compact': swm.np is not None and not args.no_compact,
+               'engine': args.engine, 'exact_limit': args.exact_limit}
+
+    results = []
+    for case in cases:
+        for k in degrees:
+            for n in sizes:
+                r = run_case_isolated(case, n, k, options, args.repeat)
+                results.append(r)
+                if not args.json:
+                    print(f"{case:<20} N={n:<8} k={k:<3} {r['seconds']:>9.3f} s "
+                          f"{r['peak_rss_mb']:>9.1f} MiB {r['edges_per_sec']:>12,.0f} edges/s"
+                          f"{'  (sampled L)' if r['sampled_paths'] else ''}", flush=True)
+
+    run = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': swm.np.__version__ if swm.np is not None else None,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'options': options,
+        'results': results,
+        'scaling_exponents': scaling_exponents(results),
+    }
+    append_history(args.history, run)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+
+    regressions = []
+    if args.baseline:
+        regressions = find_regressions(run, _latest_run(args.baseline), args.threshold)
+    run['regressions'] = regressions
+
+    if args.json:
+        print(json.dumps(run, indent=2))
+    else:
+        print("\n" + "=" * 60)
+        print("SCALING EXPONENTS (time ∝ N^a)")
+        print("=" * 60)
+        for series, exponent in run['scaling_exponents'].items():
+            print(f"{series:<36} a = {exponent:.2f}")
+        if args.baseline:
+            print("\n" + "=" * 60)
+            print(f"REGRESSIONS vs {args.baseline} (threshold {args.threshold:.0%})")
+            print("=" * 60)
+            for r in regressions:
+                print(f"✗ {r['case']} N={r['n']} k={r['k']}: {r['metric']} "
+                      f"{r['baseline']:.3f} → {r['current']:.3f} (×{r['ratio']:.2f})")
+            if not regressions:
+                print("✓ None")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
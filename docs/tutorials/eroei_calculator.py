@@ -7,15 +7,37 @@ Part of the thermodynamic-economics skill for Univrs.io.
 
 Usage:
     python eroei_calculator.py --config system.json
+    python eroei_calculator.py --batch systems.ndjson --workers 8 -o results.ndjson
+    python eroei_calculator.py --config fleet.json --format jsonl -o report.jsonl
     python eroei_calculator.py --interactive
+    python eroei_calculator.py --example hyphal --nodes 100000 --profile
+    python eroei_calculator.py --config network.json --supply net_energy --budget 5e6
+    python eroei_calculator.py --sweep --sweep-nodes 100:1e7:200:log -o hyphal_grid.npy
+    python eroei_calculator.py --example solar --monte-carlo 1000000 --seed 1 --workers 4
 """
 
 import argparse
 import json
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, TextIO, Tuple
 from enum import Enum
 
+from phase_profiler import PhaseProfiler, phase, print_phase_table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy(feature: str):
+    """Raise a helpful error when an array-backed feature is used without NumPy."""
+    if np is None:
+        raise ImportError(f"{feature} requires NumPy (pip install numpy)")
+
 
 class EnergyType(Enum):
     SOLAR_PV = "solar_pv"
@@ -35,6 +57,11 @@ class EnergyType(Enum):
     NETWORK = "network"
 
 
+# Small integer codes for EnergyType in columnar storage
+ENERGY_TYPES: List[EnergyType] = list(EnergyType)
+ENERGY_TYPE_CODES: Dict[EnergyType, int] = {t: i for i, t in enumerate(ENERGY_TYPES)}
+
+
 # Reference EROEI values from literature
 REFERENCE_EROEI: Dict[EnergyType, tuple] = {
     EnergyType.SOLAR_PV: (10, 20),           # Range: low, high
@@ -54,6 +81,22 @@ REFERENCE_EROEI: Dict[EnergyType, tuple] = {
     EnergyType.NETWORK: (0, 0),                 # Pure consumer
 }
 
+# Component parameters covered by sensitivity analysis
+SENSITIVITY_PARAMETERS = ('output', 'input', 'embodied', 'lifespan')
+
+
+def _eroei(total_output: float, total_input: float) -> float:
+    return total_output / total_input if total_input > 0 else float('inf')
+
+
+def _check_relative_change(relative_change: float):
+    if not 0 < relative_change < 1:
+        raise ValueError(f"relative_change must be in (0, 1), got {relative_change}")
+
+
+# Types whose REFERENCE_EROEI range is an efficiency rather than an EROEI
+EFFICIENCY_TYPES = (EnergyType.BATTERY_STORAGE, EnergyType.DISTRIBUTION)
+
 
 @dataclass
 class EnergyComponent:
@@ -81,36 +124,81 @@ class EnergyComponent:
     @property
     def component_eroei(self) -> float:
         """EROEI for this component alone."""
-        if self.total_annual_input <= 0:
+        total_input = self.total_annual_input
+        if total_input <= 0:
             return float('inf')
-        return self.energy_output_kwh_year / self.total_annual_input
+        return self.energy_output_kwh_year / total_input
 
 
 @dataclass 
 class EnergySystem:
-    """Represents a complete energy system with multiple components."""
+    """
+    Represents a complete energy system with multiple components.
+
+    System totals are running sums kept current by add_component,
+    remove_component and update_component, so they cost O(1) to read.
+    Change components through those methods (or call recompute_totals()
+    after editing them in place).
+    """
     name: str
     components: List[EnergyComponent] = field(default_factory=list)
-    
+    _total_output: float = field(default=0, init=False, repr=False, compare=False)
+    _total_input: float = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.recompute_totals()
+
+    def recompute_totals(self):
+        """Rebuild the running totals from the component list."""
+        self._total_output = 0
+        self._total_input = 0
+        for c in self.components:
+            self._total_output += c.energy_output_kwh_year
+            self._total_input += c.total_annual_input
+
     def add_component(self, component: EnergyComponent):
         self.components.append(component)
+        self._total_output += component.energy_output_kwh_year
+        self._total_input += component.total_annual_input
+
+    def remove_component(self, index: int) -> EnergyComponent:
+        """Remove and return the component at `index`."""
+        component = self.components.pop(index)
+        self._total_output -= component.energy_output_kwh_year
+        self._total_input -= component.total_annual_input
+        return component
+
+    def update_component(self, index: int, **changes) -> EnergyComponent:
+        """
+        Replace fields of the component at `index`, e.g.
+        update_component(0, lifespan_years=30).
+
+        Returns:
+            The updated component
+        """
+        old = self.components[index]
+        new = replace(old, **changes)
+        self.components[index] = new
+        self._total_output += new.energy_output_kwh_year - old.energy_output_kwh_year
+        self._total_input += new.total_annual_input - old.total_annual_input
+        return new
     
     @property
     def total_output(self) -> float:
         """Total system energy output."""
-        return sum(c.energy_output_kwh_year for c in self.components)
+        return self._total_output
     
     @property
     def total_input(self) -> float:
         """Total system energy input."""
-        return sum(c.total_annual_input for c in self.components)
+        return self._total_input
     
     @property
     def system_eroei(self) -> float:
         """System-wide EROEI."""
-        if self.total_input <= 0:
+        if self._total_input <= 0:
             return float('inf')
-        return self.total_output / self.total_input
+        return self._total_output / self._total_input
     
     @property
     def net_energy(self) -> float:
@@ -120,50 +208,764 @@ class EnergySystem:
     def is_viable(self, threshold: float = 7.0) -> bool:
         """Check if system EROEI meets minimum societal threshold."""
         return self.system_eroei >= threshold
+
+    def sensitivity(self, relative_change: float = 0.1, top: Optional[int] = None) -> List[Dict]:
+        """
+        Tornado table of system EROEI and net energy sensitivities.
+
+        For each component's output, operational input, embodied energy
+        and lifespan this gives the analytic partial derivatives of
+        system_eroei and net_energy, the elasticity of system_eroei, and
+        the results of scaling the parameter by 1 ± relative_change. The
+        perturbations are applied as deltas to the running totals, so the
+        whole table costs O(components × parameters).
+
+        Returns:
+            Entries sorted by EROEI swing, largest first (the top `top`
+            when given), each with 'index', 'component', 'type',
+            'parameter', 'value', 'd_eroei', 'd_net_energy', 'elasticity',
+            'eroei_low', 'eroei_high', 'net_energy_low', 'net_energy_high'
+            and 'swing'
+        """
+        _check_relative_change(relative_change)
+        total_output, total_input = self._total_output, self._total_input
+        eroei = _eroei(total_output, total_input)
+        low, high = 1 - relative_change, 1 + relative_change
+        table = []
+        for index, c in enumerate(self.components):
+            lifespan = c.lifespan_years
+            annualized = c.embodied_energy_kwh / lifespan
+            # (value, d total_output / d value, d total_input / d value,
+            #  (output delta, input delta) for a scale factor f)
+            parameters = (
+                ('output', c.energy_output_kwh_year, 1.0, 0.0,
+                 lambda f: (c.energy_output_kwh_year * (f - 1), 0.0)),
+                ('input', c.energy_input_kwh_year, 0.0, 1.0,
+                 lambda f: (0.0, c.energy_input_kwh_year * (f - 1))),
+                ('embodied', c.embodied_energy_kwh, 0.0, 1 / lifespan,
+                 lambda f: (0.0, annualized * (f - 1))),
+                ('lifespan', lifespan, 0.0, -annualized / lifespan,
+                 lambda f: (0.0, annualized * (1 / f - 1))),
+            )
+            for parameter, value, d_output, d_input, delta in parameters:
+                d_eroei = ((d_output * total_input - total_output * d_input) / total_input ** 2
+                           if total_input > 0 else 0.0)
+                (out_low, in_low), (out_high, in_high) = delta(low), delta(high)
+                eroei_low = _eroei(total_output + out_low, total_input + in_low)
+                eroei_high = _eroei(total_output + out_high, total_input + in_high)
+                table.append({
+                    'index': index,
+                    'component': c.name,
+                    'type': c.component_type.value,
+                    'parameter': parameter,
+                    'value': value,
+                    'd_eroei': d_eroei,
+                    'd_net_energy': d_output - d_input,
+                    'elasticity': d_eroei * value / eroei if 0 < eroei < float('inf') else 0.0,
+                    'eroei_low': eroei_low,
+                    'eroei_high': eroei_high,
+                    'net_energy_low': total_output + out_low - total_input - in_low,
+                    'net_energy_high': total_output + out_high - total_input - in_high,
+                    'swing': abs(eroei_high - eroei_low),
+                })
+        table.sort(key=lambda e: (e['swing'], abs(e['net_energy_high'] - e['net_energy_low'])),
+                   reverse=True)
+        return table[:top] if top is not None else table
     
-    def analyze(self) -> Dict:
-        """Comprehensive system analysis."""
-        component_analysis = []
+    def analyze(self, profiler: Optional[PhaseProfiler] = None) -> Dict:
+        """
+        Comprehensive system analysis.
+
+        Args:
+            profiler: Records the 'components' and 'system' phases
+        """
+        with phase(profiler, 'components', total=len(self.components), unit='components') as p:
+            component_analysis = list(self.iter_component_records(p))
+
+        with phase(profiler, 'system'):
+            return self._system_analysis(component_analysis)
+
+    def summary(self) -> Dict:
+        """analyze() without the per-component records; O(1) from the running totals."""
+        return system_summary(self.name, self.total_output, self.total_input)
+
+    def iter_component_records(self, progress=None) -> Iterator[Dict]:
+        """Yield analyze()'s per-component records one at a time."""
         for c in self.components:
-            component_analysis.append({
+            # Derive each figure once rather than through chained properties
+            annualized = c.embodied_energy_kwh / c.lifespan_years
+            total_input = c.energy_input_kwh_year + annualized
+            yield {
                 'name': c.name,
                 'type': c.component_type.value,
                 'output_kwh_year': c.energy_output_kwh_year,
                 'input_kwh_year': c.energy_input_kwh_year,
                 'embodied_kwh': c.embodied_energy_kwh,
                 'lifespan_years': c.lifespan_years,
-                'annualized_embodied': c.annualized_embodied,
-                'total_annual_input': c.total_annual_input,
-                'component_eroei': c.component_eroei,
+                'annualized_embodied': annualized,
+                'total_annual_input': total_input,
+                'component_eroei': (c.energy_output_kwh_year / total_input
+                                    if total_input > 0 else float('inf')),
                 'notes': c.notes
+            }
+            if progress is not None:
+                progress.advance()
+
+    def _system_analysis(self, component_analysis: List[Dict]) -> Dict:
+        return system_summary(self.name, self.total_output, self.total_input,
+                              component_analysis)
+
+
+def viability_assessment(eroei: float) -> str:
+    """Societal viability band for a system EROEI."""
+    if eroei >= 20:
+        return "Excellent - Supports complex technology development"
+    elif eroei >= 12:
+        return "Good - Supports education, healthcare, R&D"
+    elif eroei >= 7:
+        return "Marginal - Can maintain infrastructure"
+    elif eroei >= 5:
+        return "Critical - Basic industrial activity only"
+    elif eroei >= 3:
+        return "Subsistence - Basic agriculture only"
+    else:
+        return "Non-viable - Cannot sustain society"
+
+
+def system_summary(name: str, total_output: float, total_input: float,
+                   component_analysis: Optional[List[Dict]] = None) -> Dict:
+    """
+    The analyze() result for a system with the given totals; without
+    component_analysis the 'components' key is left out.
+    """
+    eroei = total_output / total_input if total_input > 0 else float('inf')
+    summary = {
+        'system_name': name,
+        'total_output_kwh_year': total_output,
+        'total_input_kwh_year': total_input,
+        'net_energy_kwh_year': total_output - total_input,
+        'system_eroei': eroei,
+        'viability_assessment': viability_assessment(eroei),
+        'meets_7_threshold': eroei >= 7.0,
+        'meets_10_threshold': eroei >= 10.0,
+    }
+    if component_analysis is not None:
+        summary['components'] = component_analysis
+    return summary
+
+
+# Rows converted from NumPy columns to Python records at a time
+RECORD_CHUNK = 1 << 16
+
+
+class ColumnarEnergySystem:
+    """
+    Energy system stored column-wise in NumPy arrays, for fleets of
+    millions of components.
+
+    Each EnergyComponent field is one array: type as a uint8 code into
+    ENERGY_TYPES, the numeric fields as float64. Names are kept in a list
+    and notes in a sparse {index: note} dict since most are empty.
+    from_system() and to_system() convert losslessly to and from the
+    dataclass API.
+    """
+
+    def __init__(self, name: str, type_codes, output, input, embodied, lifespan,
+                 efficiency=None, capacity_factor=None,
+                 names: Optional[List[str]] = None, notes: Optional[Dict[int, str]] = None):
+        _require_numpy("ColumnarEnergySystem")
+        self.name = name
+        self.type_codes = np.asarray(type_codes, dtype=np.uint8)
+        size = len(self.type_codes)
+        self.output = np.asarray(output, dtype=np.float64)
+        self.input = np.asarray(input, dtype=np.float64)
+        self.embodied = np.asarray(embodied, dtype=np.float64)
+        self.lifespan = np.asarray(lifespan, dtype=np.float64)
+        self.efficiency = (np.ones(size) if efficiency is None
+                           else np.asarray(efficiency, dtype=np.float64))
+        self.capacity_factor = (np.ones(size) if capacity_factor is None
+                                else np.asarray(capacity_factor, dtype=np.float64))
+        self.names = names
+        self.notes = dict(notes or {})
+        for column in (self.output, self.input, self.embodied, self.lifespan,
+                       self.efficiency, self.capacity_factor):
+            if column.shape != (size,):
+                raise ValueError("All component columns must be 1-D and the same length")
+
+    @classmethod
+    def from_system(cls, system: EnergySystem) -> 'ColumnarEnergySystem':
+        """Columnar copy of a dataclass-based EnergySystem."""
+        components = system.components
+        return cls(
+            system.name,
+            [ENERGY_TYPE_CODES[c.component_type] for c in components],
+            [c.energy_output_kwh_year for c in components],
+            [c.energy_input_kwh_year for c in components],
+            [c.embodied_energy_kwh for c in components],
+            [c.lifespan_years for c in components],
+            [c.efficiency for c in components],
+            [c.capacity_factor for c in components],
+            names=[c.name for c in components],
+            notes={i: c.notes for i, c in enumerate(components) if c.notes},
+        )
+
+    def to_system(self) -> EnergySystem:
+        """Dataclass-based EnergySystem with the same components."""
+        names = self.names or [f"{ENERGY_TYPES[code].value} {i}"
+                               for i, code in enumerate(self.type_codes.tolist())]
+        columns = zip(names, self.type_codes.tolist(), self.output.tolist(),
+                      self.input.tolist(), self.embodied.tolist(), self.lifespan.tolist(),
+                      self.efficiency.tolist(), self.capacity_factor.tolist())
+        components = [
+            EnergyComponent(name=name, component_type=ENERGY_TYPES[code],
+                            energy_output_kwh_year=output, energy_input_kwh_year=input_,
+                            embodied_energy_kwh=embodied, lifespan_years=lifespan,
+                            efficiency=efficiency, capacity_factor=capacity_factor,
+                            notes=self.notes.get(i, ""))
+            for i, (name, code, output, input_, embodied, lifespan, efficiency,
+                    capacity_factor) in enumerate(columns)
+        ]
+        return EnergySystem(name=self.name, components=components)
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    @property
+    def annualized_embodied(self):
+        """Per-component embodied energy amortized over lifespan."""
+        return self.embodied / self.lifespan
+
+    @property
+    def total_annual_input(self):
+        """Per-component annual input including amortized embodied."""
+        return self.input + self.annualized_embodied
+
+    @property
+    def component_eroei(self):
+        """Per-component EROEI; inf where a component has no input."""
+        total_input = self.total_annual_input
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_input > 0, self.output / total_input, np.inf)
+
+    @property
+    def total_output(self) -> float:
+        return float(self.output.sum())
+
+    @property
+    def total_input(self) -> float:
+        return float(self.total_annual_input.sum())
+
+    @property
+    def system_eroei(self) -> float:
+        total_input = self.total_input
+        if total_input <= 0:
+            return float('inf')
+        return self.total_output / total_input
+
+    @property
+    def net_energy(self) -> float:
+        return self.total_output - self.total_input
+
+    def is_viable(self, threshold: float = 7.0) -> bool:
+        return self.system_eroei >= threshold
+
+    def sensitivity(self, relative_change: float = 0.1, top: Optional[int] = None) -> List[Dict]:
+        """EnergySystem.sensitivity() computed column-wise."""
+        _check_relative_change(relative_change)
+        annualized = self.annualized_embodied
+        total_output = float(self.output.sum())
+        total_input = float((self.input + annualized).sum())
+        eroei = _eroei(total_output, total_input)
+        low, high = 1 - relative_change, 1 + relative_change
+        zeros = np.zeros(len(self))
+
+        # Rows follow SENSITIVITY_PARAMETERS: value, partials and the
+        # output/input deltas for scale factors low and high
+        values = np.stack([self.output, self.input, self.embodied, self.lifespan])
+        d_output = np.stack([zeros + 1, zeros, zeros, zeros])
+        d_input = np.stack([zeros, zeros + 1, 1 / self.lifespan, -annualized / self.lifespan])
+        out_low = np.stack([self.output * (low - 1), zeros, zeros, zeros])
+        out_high = np.stack([self.output * (high - 1), zeros, zeros, zeros])
+        in_low = np.stack([zeros, self.input * (low - 1), annualized * (low - 1),
+                           annualized * (1 / low - 1)])
+        in_high = np.stack([zeros, self.input * (high - 1), annualized * (high - 1),
+                            annualized * (1 / high - 1)])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d_eroei = ((d_output * total_input - total_output * d_input) / total_input ** 2
+                       if total_input > 0 else np.zeros_like(values))
+            eroei_low = np.where(total_input + in_low > 0,
+                                 (total_output + out_low) / (total_input + in_low), np.inf)
+            eroei_high = np.where(total_input + in_high > 0,
+                                  (total_output + out_high) / (total_input + in_high), np.inf)
+        net_low = total_output + out_low - total_input - in_low
+        net_high = total_output + out_high - total_input - in_high
+        swing = np.abs(eroei_high - eroei_low)
+        elasticity = d_eroei * values / eroei if 0 < eroei < float('inf') else np.zeros_like(values)
+
+        # Sort by swing, then net-energy swing, both descending
+        order = np.lexsort((-np.abs(net_high - net_low).ravel(), -swing.ravel()))
+        if top is not None:
+            order = order[:top]
+        rows, index = np.divmod(order, len(self))
+        names = self.names
+        table = []
+        for flat, row, i in zip(order.tolist(), rows.tolist(), index.tolist()):
+            table.append({
+                'index': i,
+                'component': names[i] if names else f"{ENERGY_TYPES[self.type_codes[i]].value} {i}",
+                'type': ENERGY_TYPES[self.type_codes[i]].value,
+                'parameter': SENSITIVITY_PARAMETERS[row],
+                'value': float(values.flat[flat]),
+                'd_eroei': float(d_eroei.flat[flat]),
+                'd_net_energy': float(d_output.flat[flat] - d_input.flat[flat]),
+                'elasticity': float(elasticity.flat[flat]),
+                'eroei_low': float(eroei_low.flat[flat]),
+                'eroei_high': float(eroei_high.flat[flat]),
+                'net_energy_low': float(net_low.flat[flat]),
+                'net_energy_high': float(net_high.flat[flat]),
+                'swing': float(swing.flat[flat]),
             })
-        
-        # Viability assessment
-        eroei = self.system_eroei
-        if eroei >= 20:
-            viability = "Excellent - Supports complex technology development"
-        elif eroei >= 12:
-            viability = "Good - Supports education, healthcare, R&D"
-        elif eroei >= 7:
-            viability = "Marginal - Can maintain infrastructure"
-        elif eroei >= 5:
-            viability = "Critical - Basic industrial activity only"
-        elif eroei >= 3:
-            viability = "Subsistence - Basic agriculture only"
+        return table
+
+    def rollup_by_type(self) -> Dict[str, Dict]:
+        """
+        Totals per EnergyType present in the system.
+
+        Returns:
+            {type value: {'count', 'output_kwh_year', 'input_kwh_year',
+            'net_energy_kwh_year', 'eroei'}}
+        """
+        size = len(ENERGY_TYPES)
+        counts = np.bincount(self.type_codes, minlength=size)
+        outputs = np.bincount(self.type_codes, weights=self.output, minlength=size)
+        inputs = np.bincount(self.type_codes, weights=self.total_annual_input, minlength=size)
+        rollup = {}
+        for code in np.flatnonzero(counts).tolist():
+            rollup[ENERGY_TYPES[code].value] = {
+                'count': int(counts[code]),
+                'output_kwh_year': float(outputs[code]),
+                'input_kwh_year': float(inputs[code]),
+                'net_energy_kwh_year': float(outputs[code] - inputs[code]),
+                'eroei': float(outputs[code] / inputs[code]) if inputs[code] > 0 else float('inf'),
+            }
+        return rollup
+
+    def analyze(self, profiler: Optional[PhaseProfiler] = None) -> Dict:
+        """Same result as EnergySystem.analyze(), computed column-wise."""
+        with phase(profiler, 'components', total=len(self), unit='components') as p:
+            component_analysis = list(self.iter_component_records(p))
+
+        with phase(profiler, 'system'):
+            return system_summary(self.name, self.total_output, self.total_input,
+                                  component_analysis)
+
+    def summary(self) -> Dict:
+        """analyze() without the per-component records."""
+        return system_summary(self.name, self.total_output, self.total_input)
+
+    def iter_component_records(self, progress=None,
+                               chunk: int = RECORD_CHUNK) -> Iterator[Dict]:
+        """
+        Yield analyze()'s per-component records, converting the columns
+        to Python values `chunk` rows at a time.
+        """
+        type_values = [t.value for t in ENERGY_TYPES]
+        for start in range(0, len(self), chunk):
+            stop = min(start + chunk, len(self))
+            output = self.output[start:stop]
+            input_ = self.input[start:stop]
+            annualized = self.embodied[start:stop] / self.lifespan[start:stop]
+            total_input = input_ + annualized
+            with np.errstate(divide='ignore', invalid='ignore'):
+                eroei = np.where(total_input > 0, output / total_input, np.inf)
+            codes = self.type_codes[start:stop].tolist()
+            names = (self.names[start:stop] if self.names else
+                     [f"{type_values[code]} {i}" for i, code in enumerate(codes, start)])
+            columns = zip(names, codes, output.tolist(), input_.tolist(),
+                          self.embodied[start:stop].tolist(), self.lifespan[start:stop].tolist(),
+                          annualized.tolist(), total_input.tolist(), eroei.tolist())
+            for i, (name, code, out, inp, embodied, lifespan, annual, total,
+                    ratio) in enumerate(columns, start):
+                yield {'name': name, 'type': type_values[code], 'output_kwh_year': out,
+                       'input_kwh_year': inp, 'embodied_kwh': embodied,
+                       'lifespan_years': lifespan, 'annualized_embodied': annual,
+                       'total_annual_input': total, 'component_eroei': ratio,
+                       'notes': self.notes.get(i, "")}
+            if progress is not None:
+                progress.advance(stop - start)
+
+
+DISTRIBUTION_KINDS = ('fixed', 'uniform', 'triangular', 'normal', 'lognormal')
+MONTE_CARLO_PARAMETERS = ('output', 'embodied', 'lifespan', 'efficiency')
+MONTE_CARLO_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Sampled values per batch (draws x components), bounding memory per process
+MONTE_CARLO_BATCH_ELEMENTS = 1 << 22
+
+# Lower bound on sampled multipliers, so a wide normal cannot produce a
+# zero or negative lifespan
+_MIN_FACTOR = 1e-6
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    A sampling distribution for one uncertain component parameter.
+
+    kind is one of DISTRIBUTION_KINDS; params are (value,) for 'fixed',
+    (low, high) for 'uniform', (low, mode, high) for 'triangular',
+    (mean, sd) for 'normal' and (mu, sigma) of the underlying normal for
+    'lognormal'.
+    """
+    kind: str
+    params: tuple = ()
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Unknown distribution {self.kind!r}; "
+                             f"expected one of {', '.join(DISTRIBUTION_KINDS)}")
+
+    @classmethod
+    def from_spec(cls, spec) -> 'Distribution':
+        """From a config entry: ['uniform', 0.8, 1.2] or {'dist': 'uniform', 'params': [0.8, 1.2]}."""
+        if isinstance(spec, Distribution):
+            return spec
+        if isinstance(spec, dict):
+            return cls(spec['dist'], tuple(spec.get('params', ())))
+        return cls(spec[0], tuple(spec[1:]))
+
+    def sample(self, rng, shape):
+        if self.kind == 'fixed':
+            return np.full(shape, float(self.params[0]))
+        if self.kind == 'uniform':
+            return rng.uniform(self.params[0], self.params[1], shape)
+        if self.kind == 'triangular':
+            return rng.triangular(self.params[0], self.params[1], self.params[2], shape)
+        if self.kind == 'normal':
+            return rng.normal(self.params[0], self.params[1], shape)
+        return rng.lognormal(self.params[0], self.params[1], shape)
+
+
+def default_distribution(parameter: str, energy_type: EnergyType) -> Optional[Distribution]:
+    """
+    Uncertainty implied by REFERENCE_EROEI, or None where it gives none.
+
+    Generation types get an output multiplier spanning their literature
+    EROEI range relative to its midpoint; storage and distribution get
+    their efficiency drawn from the reference efficiency range. Embodied
+    energy and lifespan have no reference range, and sampling them by
+    default would double-count the spread already in the EROEI range.
+    """
+    low, high = REFERENCE_EROEI[energy_type]
+    if high <= low:
+        return None
+    if parameter == 'output' and energy_type not in EFFICIENCY_TYPES:
+        mid = (low + high) / 2
+        return Distribution('uniform', (low / mid, high / mid))
+    if parameter == 'efficiency' and energy_type in EFFICIENCY_TYPES:
+        return Distribution('uniform', (low, high))
+    return None
+
+
+def _resolve_distributions(type_codes, distributions: Optional[Dict]) -> List[Tuple]:
+    """
+    Group component indices by type with the distribution of each parameter.
+
+    `distributions` maps 'parameter' or 'parameter:type_value' (e.g.
+    'lifespan:solar_pv') to a Distribution or config spec; the more
+    specific key wins over the plain one, which wins over the default.
+    """
+    distributions = {key: Distribution.from_spec(spec)
+                     for key, spec in (distributions or {}).items()}
+    for key in distributions:
+        if key.split(':')[0] not in MONTE_CARLO_PARAMETERS:
+            raise ValueError(f"Unknown Monte Carlo parameter {key!r}; "
+                             f"expected one of {', '.join(MONTE_CARLO_PARAMETERS)}")
+    groups = []
+    for code in np.flatnonzero(np.bincount(type_codes, minlength=len(ENERGY_TYPES))).tolist():
+        energy_type = ENERGY_TYPES[code]
+        specs = {}
+        for parameter in MONTE_CARLO_PARAMETERS:
+            specs[parameter] = distributions.get(
+                f"{parameter}:{energy_type.value}",
+                distributions.get(parameter, default_distribution(parameter, energy_type)))
+        if any(specs.values()):
+            groups.append((np.flatnonzero(type_codes == code), specs))
+    return groups
+
+
+def _factor(spec: Optional[Distribution], rng, shape):
+    if spec is None:
+        return 1.0
+    return np.maximum(spec.sample(rng, shape), _MIN_FACTOR)
+
+
+_MONTE_CARLO_CONTEXT: Dict = {}
+
+
+def _init_monte_carlo_worker(context: Dict):
+    _MONTE_CARLO_CONTEXT.update(context)
+
+
+def _monte_carlo_batch(job: Tuple) -> Tuple:
+    """Total output and input for one batch of draws from its own stream."""
+    seed_sequence, size = job
+    ctx = _MONTE_CARLO_CONTEXT
+    rng = np.random.default_rng(seed_sequence)
+    output = np.full(size, ctx['fixed_output'])
+    total_input = np.full(size, ctx['fixed_input'])
+    for idx, specs in ctx['groups']:
+        shape = (size, len(idx))
+        efficiency = ctx['efficiency'][idx]
+        out = ctx['output'][idx] * _factor(specs['output'], rng, shape)
+        if specs['efficiency'] is not None:
+            sampled = np.clip(specs['efficiency'].sample(rng, shape), _MIN_FACTOR, 1.0)
+            # Output scales with efficiency relative to the modeled point value
+            out = out * np.divide(sampled, efficiency, out=np.ones(shape), where=efficiency > 0)
+        embodied = ctx['embodied'][idx] * _factor(specs['embodied'], rng, shape)
+        lifespan = ctx['lifespan'][idx] * _factor(specs['lifespan'], rng, shape)
+        annual = ctx['input'][idx] + embodied / lifespan
+        output += out.sum(axis=-1) if np.ndim(out) == 2 else out.sum()
+        total_input += annual.sum(axis=-1) if np.ndim(annual) == 2 else annual.sum()
+    return output, total_input
+
+
+def _percentiles(values, empty: float) -> Dict[str, float]:
+    """MONTE_CARLO_PERCENTILES of `values`, or `empty` for each if there are none."""
+    if not values.size:
+        return {f"p{q}": empty for q in MONTE_CARLO_PERCENTILES}
+    return {f"p{q}": float(v) for q, v in
+            zip(MONTE_CARLO_PERCENTILES, np.percentile(values, MONTE_CARLO_PERCENTILES))}
+
+
+def monte_carlo_eroei(system, draws: int = 1_000_000, seed: Optional[int] = None,
+                      workers: int = 1, distributions: Optional[Dict] = None,
+                      profiler: Optional[PhaseProfiler] = None) -> Dict:
+    """
+    Monte Carlo distribution of system EROEI and net energy.
+
+    Each draw samples every component's output, embodied energy, lifespan
+    and efficiency independently (see default_distribution and
+    _resolve_distributions for the defaults and overrides) and evaluates
+    the system totals in batched array form. Batches draw from
+    independent streams spawned from `seed`, so results depend on the
+    seed but not on the number of workers.
+
+    Args:
+        system: EnergySystem or ColumnarEnergySystem
+        draws: Number of samples
+        seed: Seed for reproducible draws
+        workers: Processes evaluating batches in parallel
+        distributions: Overrides keyed by 'parameter' or
+            'parameter:type_value'; 'efficiency' distributions give the
+            efficiency itself, the others multiply the component's value
+        profiler: Records the 'monte_carlo' phase
+
+    Returns:
+        Dict with 'draws', 'seed', 'mean', 'std', 'percentiles' of
+        system EROEI and 'net_energy_percentiles' over the finite draws,
+        'non_finite_draws' (zero-input draws, whose EROEI is unbounded),
+        and 'p_meets_7' / 'p_meets_10', the probabilities of EROEI ≥ 7
+        and ≥ 10 over all draws
+    """
+    _require_numpy("Monte Carlo analysis")
+    columns = (system if isinstance(system, ColumnarEnergySystem)
+               else ColumnarEnergySystem.from_system(system))
+    groups = _resolve_distributions(columns.type_codes, distributions)
+    sampled = np.zeros(len(columns), dtype=bool)
+    for idx, _ in groups:
+        sampled[idx] = True
+    context = {
+        'groups': groups,
+        'fixed_output': float(columns.output[~sampled].sum()),
+        'fixed_input': float(columns.total_annual_input[~sampled].sum()),
+        'output': columns.output, 'input': columns.input, 'embodied': columns.embodied,
+        'lifespan': columns.lifespan, 'efficiency': columns.efficiency,
+    }
+
+    batch = max(1, MONTE_CARLO_BATCH_ELEMENTS // max(int(sampled.sum()), 1))
+    sizes = [min(batch, draws - start) for start in range(0, draws, batch)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = list(zip(streams, sizes))
+
+    output = np.empty(draws)
+    total_input = np.empty(draws)
+    with phase(profiler, 'monte_carlo', total=draws, unit='draws') as p:
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_monte_carlo_worker,
+                                     initargs=(context,)) as pool:
+                results = pool.map(_monte_carlo_batch, jobs)
+                start = 0
+                for size, (out, inp) in zip(sizes, results):
+                    output[start:start + size] = out
+                    total_input[start:start + size] = inp
+                    start += size
+                    p.advance(size)
         else:
-            viability = "Non-viable - Cannot sustain society"
-        
-        return {
-            'system_name': self.name,
-            'total_output_kwh_year': self.total_output,
-            'total_input_kwh_year': self.total_input,
-            'net_energy_kwh_year': self.net_energy,
-            'system_eroei': eroei,
-            'viability_assessment': viability,
-            'meets_7_threshold': self.is_viable(7.0),
-            'meets_10_threshold': self.is_viable(10.0),
-            'components': component_analysis
-        }
+            _init_monte_carlo_worker(context)
+            start = 0
+            for job in jobs:
+                out, inp = _monte_carlo_batch(job)
+                output[start:start + job[1]] = out
+                total_input[start:start + job[1]] = inp
+                start += job[1]
+                p.advance(job[1])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eroei = np.where(total_input > 0, output / total_input, np.inf)
+    net = output - total_input
+    # Zero-input draws have unbounded EROEI; percentiles over them come out
+    # inf or nan, so they are counted instead of summarised
+    finite = eroei[np.isfinite(eroei)]
+    net = net[np.isfinite(net)]
+    return {
+        'draws': draws,
+        'seed': seed,
+        'non_finite_draws': int(draws - finite.size),
+        'mean': float(finite.mean()) if finite.size else float('inf'),
+        'std': float(finite.std()) if finite.size else 0.0,
+        'percentiles': _percentiles(finite, empty=float('inf')),
+        'net_energy_percentiles': _percentiles(net, empty=float('nan')),
+        'p_meets_7': float(np.mean(eroei >= 7.0)),
+        'p_meets_10': float(np.mean(eroei >= 10.0)),
+    }
+
+
+def print_tornado(table: List[Dict], width: int = 30):
+    """Pretty print a sensitivity() table with text tornado bars."""
+    print("\n" + "-" * 70)
+    print("SENSITIVITY (system EROEI, parameter scaled low → high)")
+    print("-" * 70)
+    largest = max((e['swing'] for e in table if e['swing'] != float('inf')), default=0.0)
+    for e in table:
+        bar = '#' * (round(width * e['swing'] / largest) if largest > 0 else 0)
+        print(f"{e['component'][:28]:<28} {e['parameter']:<9} "
+              f"{e['eroei_low']:>8.2f} → {e['eroei_high']:<8.2f} {bar}")
+
+
+def print_monte_carlo(result: Dict):
+    """Pretty print a monte_carlo_eroei result."""
+    print("\n" + "-" * 70)
+    print(f"MONTE CARLO UNCERTAINTY ({result['draws']:,} draws)")
+    print("-" * 70)
+    print(f"Mean EROEI:             {result['mean']:.2f} ± {result['std']:.2f} (sd)")
+    print("EROEI percentiles:      " + "  ".join(
+        f"{name}={value:.2f}" for name, value in result['percentiles'].items()))
+    if result['non_finite_draws']:
+        print(f"⚠ {result['non_finite_draws']:,} zero-input draws with unbounded EROEI "
+              f"left out of the mean and percentiles")
+    print(f"P(EROEI ≥ 7):           {result['p_meets_7']:.1%}")
+    print(f"P(EROEI ≥ 10):          {result['p_meets_10']:.1%}")
+
+
+_COMPONENT_FIELDS = tuple(f.name for f in fields(EnergyComponent))
+_REQUIRED_COMPONENT_FIELDS = ('name', 'component_type', 'energy_output_kwh_year',
+                              'energy_input_kwh_year', 'embodied_energy_kwh', 'lifespan_years')
+
+
+def component_from_dict(data: Dict) -> EnergyComponent:
+    """
+    Build an EnergyComponent from a config entry.
+
+    Keys are the EnergyComponent field names; 'type' is accepted for
+    'component_type', whose value is an EnergyType value such as
+    'solar_pv'. Unknown keys are an error so typos do not pass silently.
+    """
+    data = dict(data)
+    if 'type' in data and 'component_type' not in data:
+        data['component_type'] = data.pop('type')
+    unknown = set(data) - set(_COMPONENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown component fields: {', '.join(sorted(unknown))}")
+    missing = [key for key in _REQUIRED_COMPONENT_FIELDS if key not in data]
+    if missing:
+        raise ValueError(f"Component {data.get('name', '?')!r} is missing: {', '.join(missing)}")
+    try:
+        data['component_type'] = EnergyType(data['component_type'])
+    except ValueError:
+        raise ValueError(f"Unknown component type {data['component_type']!r}; expected one of "
+                         f"{', '.join(t.value for t in EnergyType)}") from None
+    if data['lifespan_years'] <= 0:
+        raise ValueError(f"Component {data['name']!r} needs a positive lifespan_years")
+    return EnergyComponent(**data)
+
+
+def system_from_dict(data: Dict) -> EnergySystem:
+    """
+    Build an EnergySystem from a config document:
+    {"name": ..., "components": [{...}, ...]}. Other top-level keys
+    (e.g. "uncertainty" for --monte-carlo) are left to the caller.
+    """
+    if 'name' not in data:
+        raise ValueError("System config needs a 'name'")
+    system = EnergySystem(name=data['name'])
+    for i, component in enumerate(data.get('components', [])):
+        try:
+            system.add_component(component_from_dict(component))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"components[{i}]: {e}") from None
+    return system
+
+
+def system_to_dict(system: EnergySystem) -> Dict:
+    """Config document for `system`; inverse of system_from_dict."""
+    components = []
+    for c in system.components:
+        entry = asdict(c)
+        entry['component_type'] = c.component_type.value
+        components.append(entry)
+    return {'name': system.name, 'components': components}
+
+
+def load_system(path: str) -> EnergySystem:
+    """Load an EnergySystem from a JSON config file."""
+    with open(path, 'r') as f:
+        return system_from_dict(json.load(f))
+
+
+def _analyze_line(job: Tuple[int, str, bool]) -> Dict:
+    """Analyze one NDJSON system definition; errors become error records."""
+    line_number, line, summary_only = job
+    try:
+        system = system_from_dict(json.loads(line))
+        return system.summary() if summary_only else system.analyze()
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        return {'line': line_number, 'error': str(e)}
+
+
+def analyze_ndjson(lines: Iterable[str], workers: int = 1, window: Optional[int] = None,
+                   summary_only: bool = False) -> Iterator[Dict]:
+    """
+    Stream analyze() results for newline-delimited system configs.
+
+    Lines are read lazily and at most `window` systems (default
+    4 * workers) are in flight at once, so memory stays flat however
+    long the input is. Results come out in input order. A line that
+    fails to parse yields {'line', 'error'} instead of stopping the run;
+    blank lines are skipped.
+
+    Args:
+        lines: Iterable of JSON documents, one system per line
+        workers: Processes analyzing systems in parallel
+        window: Maximum systems queued or running at once
+        summary_only: Yield summary() results without component records
+    """
+    jobs = ((i, line, summary_only) for i, line in enumerate(lines, 1) if line.strip())
+    if workers <= 1:
+        for job in jobs:
+            yield _analyze_line(job)
+        return
+
+    window = window or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(_analyze_line, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 def create_example_solar_system() -> EnergySystem:
@@ -209,6 +1011,15 @@ def create_example_solar_system() -> EnergySystem:
     return system
 
 
+# Hyphal network cost model shared by create_hyphal_network_system and
+# hyphal_network_sweep
+HOURS_PER_YEAR = 8760
+HYPHAL_NODE_EMBODIED_KWH = 500       # ~500 kWh per node manufacturing
+HYPHAL_NODE_LIFESPAN_YEARS = 5
+HYPHAL_NETWORK_EMBODIED_KWH = 50     # Network equipment per node
+HYPHAL_NETWORK_LIFESPAN_YEARS = 10
+
+
 def create_hyphal_network_system(
     num_nodes: int = 1000,
     power_per_node_w: float = 100,
@@ -218,12 +1029,13 @@ def create_hyphal_network_system(
     Model energy costs for a distributed Hyphal Network.
     
     This is what Dr. Arnoux is asking: where does the energy come from?
+    network_energy.py replaces the flat overhead factor with one derived
+    from an actual topology's hop counts and relay load.
     """
     system = EnergySystem(name=f"Hyphal Network ({num_nodes} nodes)")
     
     # Calculate annual energy for computation
-    hours_per_year = 8760
-    node_energy_kwh = (power_per_node_w / 1000) * hours_per_year * num_nodes
+    node_energy_kwh = (power_per_node_w / 1000) * HOURS_PER_YEAR * num_nodes
     network_energy_kwh = node_energy_kwh * (network_overhead_factor - 1)
     
     # Computation nodes (pure consumers)
@@ -232,8 +1044,8 @@ def create_hyphal_network_system(
         component_type=EnergyType.COMPUTATION,
         energy_output_kwh_year=0,            # Produces no energy
         energy_input_kwh_year=node_energy_kwh,
-        embodied_energy_kwh=num_nodes * 500, # ~500 kWh per node manufacturing
-        lifespan_years=5,
+        embodied_energy_kwh=num_nodes * HYPHAL_NODE_EMBODIED_KWH,
+        lifespan_years=HYPHAL_NODE_LIFESPAN_YEARS,
         notes="Spirit execution, VUDO VM runtime"
     ))
     
@@ -243,95 +1055,687 @@ def create_hyphal_network_system(
         component_type=EnergyType.NETWORK,
         energy_output_kwh_year=0,            # Produces no energy
         energy_input_kwh_year=network_energy_kwh,
-        embodied_energy_kwh=num_nodes * 50,  # Network equipment
-        lifespan_years=10,
+        embodied_energy_kwh=num_nodes * HYPHAL_NETWORK_EMBODIED_KWH,
+        lifespan_years=HYPHAL_NETWORK_LIFESPAN_YEARS,
         notes="P2P communication, consensus"
     ))
     
     return system
 
 
-def print_analysis(analysis: Dict):
-    """Pretty print system analysis."""
-    print("\n" + "=" * 70)
-    print(f"ENERGY SYSTEM ANALYSIS: {analysis['system_name']}")
-    print("=" * 70)
-    
-    print(f"\nTotal Output:           {analysis['total_output_kwh_year']:,.0f} kWh/year")
-    print(f"Total Input:            {analysis['total_input_kwh_year']:,.0f} kWh/year")
-    print(f"Net Energy:             {analysis['net_energy_kwh_year']:,.0f} kWh/year")
-    print(f"\nSystem EROEI:           {analysis['system_eroei']:.2f}")
-    print(f"Viability:              {analysis['viability_assessment']}")
-    print(f"Meets 7:1 threshold:    {'YES ✓' if analysis['meets_7_threshold'] else 'NO ✗'}")
-    print(f"Meets 10:1 threshold:   {'YES ✓' if analysis['meets_10_threshold'] else 'NO ✗'}")
-    
-    print("\n" + "-" * 70)
-    print("COMPONENT BREAKDOWN")
-    print("-" * 70)
-    
-    for c in analysis['components']:
-        print(f"\n{c['name']} ({c['type']})")
-        print(f"  Output:           {c['output_kwh_year']:,.0f} kWh/year")
-        print(f"  Operational input: {c['input_kwh_year']:,.0f} kWh/year")
-        print(f"  Annualized embodied: {c['annualized_embodied']:,.0f} kWh/year")
-        print(f"  Total input:      {c['total_annual_input']:,.0f} kWh/year")
+HYPHAL_SWEEP_FIELDS = ('num_nodes', 'power_per_node_w', 'network_overhead_factor',
+                       'node_energy_kwh_year', 'network_energy_kwh_year', 'embodied_energy_kwh',
+                       'annualized_embodied_kwh_year', 'required_supply_kwh_year')
+
+# Grid points evaluated per block, bounding sweep memory
+SWEEP_CHUNK_POINTS = 1 << 20
+
+
+def parse_values(spec: str) -> List[float]:
+    """'a,b,c', a linear range 'start:stop:points' or a log range 'start:stop:points:log'."""
+    if ':' in spec:
+        start, stop, points, *scale = spec.split(':')
+        if scale == ['log']:
+            return np.geomspace(float(start), float(stop), int(points)).tolist()
+        if scale:
+            raise ValueError(f"Unknown range scale {scale[0]!r} in {spec!r}; expected 'log'")
+        return np.linspace(float(start), float(stop), int(points)).tolist()
+    return [float(x) for x in spec.split(',') if x]
+
+
+def hyphal_network_sweep(num_nodes, power_per_node_w, network_overhead_factor,
+                         chunk_points: int = SWEEP_CHUNK_POINTS) -> Iterator:
+    """
+    Energy figures of create_hyphal_network_system over a parameter grid.
+
+    Evaluates the same cost model as array operations over every
+    combination of the three axes (num_nodes outermost), in blocks of
+    about chunk_points grid points, without building EnergySystems.
+
+    Yields:
+        Structured arrays with HYPHAL_SWEEP_FIELDS columns;
+        required_supply_kwh_year is the system's total annual input
+    """
+    _require_numpy("hyphal_network_sweep")
+    nodes = np.asarray(num_nodes, dtype=np.float64)
+    power = np.asarray(power_per_node_w, dtype=np.float64)[None, :, None]
+    overhead = np.asarray(network_overhead_factor, dtype=np.float64)[None, None, :]
+    inner = power.size * overhead.size
+    dtype = np.dtype([(name, np.float64) for name in HYPHAL_SWEEP_FIELDS])
+    rows = max(1, chunk_points // max(inner, 1))
+
+    for start in range(0, nodes.size, rows):
+        n = nodes[start:start + rows, None, None]
+        shape = (n.shape[0], power.shape[1], overhead.shape[2])
+        node_energy = power / 1000 * HOURS_PER_YEAR * n
+        network_energy = node_energy * (overhead - 1)
+        annualized = n * (HYPHAL_NODE_EMBODIED_KWH / HYPHAL_NODE_LIFESPAN_YEARS
+                          + HYPHAL_NETWORK_EMBODIED_KWH / HYPHAL_NETWORK_LIFESPAN_YEARS)
+        block = np.empty(shape, dtype=dtype)
+        block['num_nodes'] = n
+        block['power_per_node_w'] = power
+        block['network_overhead_factor'] = overhead
+        block['node_energy_kwh_year'] = node_energy
+        block['network_energy_kwh_year'] = network_energy
+        block['embodied_energy_kwh'] = n * (HYPHAL_NODE_EMBODIED_KWH + HYPHAL_NETWORK_EMBODIED_KWH)
+        block['annualized_embodied_kwh_year'] = annualized
+        block['required_supply_kwh_year'] = node_energy + network_energy + annualized
+        yield block.ravel()
+
+
+def write_hyphal_sweep(path: Optional[str], num_nodes, power_per_node_w, network_overhead_factor,
+                       profiler: Optional[PhaseProfiler] = None) -> int:
+    """
+    Write a hyphal_network_sweep table and return its number of rows.
+
+    A path ending in .npy gets a NumPy structured array (readable with
+    np.load(path, mmap_mode='r')); anything else, or stdout when path
+    is None, gets CSV with a header row.
+    """
+    total = len(num_nodes) * len(power_per_node_w) * len(network_overhead_factor)
+    chunks = hyphal_network_sweep(num_nodes, power_per_node_w, network_overhead_factor)
+    written = 0
+    with phase(profiler, 'sweep', total=total, unit='points') as p:
+        if path is not None and path.endswith('.npy'):
+            dtype = np.dtype([(name, np.float64) for name in HYPHAL_SWEEP_FIELDS])
+            table = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(total,))
+            for block in chunks:
+                table[written:written + block.size] = block
+                written += block.size
+                p.advance(block.size)
+            table.flush()
+            del table
+            return written
+
+        out = open(path, 'w') if path is not None else sys.stdout
+        try:
+            out.write(','.join(HYPHAL_SWEEP_FIELDS) + '\n')
+            for block in chunks:
+                np.savetxt(out, block.view((np.float64, len(HYPHAL_SWEEP_FIELDS))),
+                           delimiter=',', fmt='%.10g')
+                written += block.size
+                p.advance(block.size)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return written
+
+
+SUPPLY_OBJECTIVES = ('eroei', 'net_energy')
+
+# Bisection steps on the budget multiplier in solve_supply_mix
+_BUDGET_BISECTION_STEPS = 100
+
+
+@dataclass
+class SupplyCandidate:
+    """
+    A generation source the supply-mix optimizer may build.
+
+    max_kwh_year bounds its annual output; cost_per_kwh_year is the cost
+    of each kWh/year of output, in whatever unit the budget uses; eroei
+    defaults to the midpoint of its REFERENCE_EROEI range.
+    """
+    energy_type: EnergyType
+    max_kwh_year: float = float('inf')
+    cost_per_kwh_year: float = 0.0
+    eroei: Optional[float] = None
+    name: str = ""
+
+    @property
+    def effective_eroei(self) -> float:
+        if self.eroei is not None:
+            return self.eroei
+        low, high = REFERENCE_EROEI[self.energy_type]
+        return (low + high) / 2
+
+
+# Indicative unsubsidized levelized cost in USD per kWh, so the default
+# candidates' budget is an annual spend in USD
+REFERENCE_COST_PER_KWH: Dict[EnergyType, float] = {
+    EnergyType.SOLAR_PV: 0.06,
+    EnergyType.WIND_ONSHORE: 0.05,
+    EnergyType.WIND_OFFSHORE: 0.11,
+    EnergyType.HYDRO: 0.07,
+    EnergyType.GEOTHERMAL: 0.08,
+    EnergyType.NATURAL_GAS: 0.07,
+    EnergyType.COAL: 0.11,
+    EnergyType.OIL_CONVENTIONAL: 0.20,
+    EnergyType.OIL_TIGHT: 0.25,
+    EnergyType.NUCLEAR: 0.15,
+    EnergyType.BIOMASS: 0.10,
+}
+
+
+def default_supply_candidates() -> List[SupplyCandidate]:
+    """Every REFERENCE_EROEI generation type, unbounded, at REFERENCE_COST_PER_KWH."""
+    return [SupplyCandidate(t, cost_per_kwh_year=REFERENCE_COST_PER_KWH[t])
+            for t, (low, high) in REFERENCE_EROEI.items()
+            if t not in EFFICIENCY_TYPES and low > 1]
+
+
+def supply_candidate_from_dict(data: Dict) -> SupplyCandidate:
+    """Config entry {'type': 'wind_onshore', 'max_kwh_year': ..., ...}."""
+    data = dict(data)
+    data['energy_type'] = EnergyType(data.pop('type', data.get('energy_type')))
+    return SupplyCandidate(**data)
+
+
+def _greedy_fill(keys, yields, capacity, target):
+    """
+    Fill `target` from items in descending key order, per row.
+
+    Each unit of item j contributes yields[..., j]; items are taken up to
+    capacity in order until the target is met, the last one partially.
+    keys and yields have shape (scenarios, items), target (scenarios,).
+    """
+    order = np.argsort(-keys, axis=1, kind='stable')
+    rows = np.arange(keys.shape[0])[:, None]
+    ordered_yield = yields[rows, order]
+    ordered_capacity = capacity[rows, order]
+    with np.errstate(invalid='ignore'):
+        full = ordered_yield * ordered_capacity
+    full = np.where(ordered_capacity > 0, full, 0.0)
+    before = np.concatenate([np.zeros((keys.shape[0], 1)), np.cumsum(full, axis=1)[:, :-1]], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        take = np.clip((target[:, None] - before) / ordered_yield, 0, ordered_capacity)
+    take = np.where(ordered_yield > 0, take, 0.0)
+    x = np.empty_like(take)
+    x[rows, order] = take
+    return x
+
+
+def solve_supply_mix(demand, eroei, capacity, cost=None, budget=None,
+                     objective: str = 'eroei'):
+    """
+    Optimal supply allocations for many scenarios at once.
+
+    Each unit of output from candidate j costs 1/eroei_j units of input,
+    so it contributes a_j = 1 - 1/eroei_j of net energy. Every scenario
+    must deliver net energy ≥ demand within the capacities and, if
+    given, the budget (Σ cost_j x_j ≤ budget).
+
+    'eroei' minimizes gross generation for the demand, i.e. maximizes the
+    EROEI of the supply mix: a greedy fill by a_j is optimal without a
+    budget; with one, the budget is dualized and its multiplier bisected,
+    and the two bracketing greedy solutions are blended to spend exactly
+    the budget (the LP optimum). 'net_energy' maximizes net energy within
+    the budget, a fractional knapsack filled by a_j / cost_j; it needs a
+    budget or finite capacities.
+
+    Args:
+        demand: Net energy required, shape (scenarios,) or scalar
+        eroei, capacity, cost: Per candidate, shape (candidates,) or
+            (scenarios, candidates)
+        budget: Scalar, (scenarios,) or None
+
+    Returns:
+        Output per candidate in kWh/year, shape (scenarios, candidates);
+        rows of infeasible scenarios are NaN
+    """
+    _require_numpy("solve_supply_mix")
+    if objective not in SUPPLY_OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; expected one of {', '.join(SUPPLY_OBJECTIVES)}")
+    demand = np.atleast_1d(np.asarray(demand, dtype=np.float64))
+    eroei = np.atleast_2d(np.asarray(eroei, dtype=np.float64))
+    scenarios = max(demand.shape[0], eroei.shape[0])
+    shape = (scenarios, eroei.shape[1])
+    demand = np.broadcast_to(demand, (scenarios,))
+    eroei = np.broadcast_to(eroei, shape)
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), shape)
+    cost = np.broadcast_to(np.asarray(0.0 if cost is None else cost, dtype=np.float64), shape)
+    with np.errstate(divide='ignore'):
+        yields = np.where(eroei > 1, 1 - 1 / eroei, 0.0)
+
+    if objective == 'net_energy':
+        if budget is None:
+            if np.isinf(capacity[yields > 0]).any():
+                raise ValueError("Maximizing net energy needs a budget or finite capacities")
+            x = np.where(yields > 0, capacity, 0.0)
+        else:
+            budget = np.broadcast_to(np.asarray(budget, dtype=np.float64), (scenarios,))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                keys = np.where(yields > 0, np.where(cost > 0, yields / cost, np.inf), -1.0)
+                per_cost = np.where(cost > 0, 1.0, 0.0)
+            free = (cost <= 0) & (yields > 0)
+            if np.isinf(capacity[free]).any():
+                raise ValueError("A free candidate with unbounded capacity makes net energy unbounded")
+            # Free capacity first, then fill the budget by net energy per cost
+            x = np.where(free, capacity, 0.0)
+            x += _greedy_fill(np.where(free, -1.0, keys), np.where(free, 0.0, per_cost * cost),
+                              np.where(free | (yields <= 0), 0.0, capacity), budget)
+        net = (x * yields).sum(axis=1)
+        return np.where((net >= demand * (1 - 1e-12))[:, None], x, np.nan)
+
+    x = _greedy_fill(yields, yields, capacity, demand)
+    if budget is not None:
+        budget = np.broadcast_to(np.asarray(budget, dtype=np.float64), (scenarios,))
+        over = (x * cost).sum(axis=1) > budget
+        if over.any():
+            x[over] = _budgeted_fill(yields[over], capacity[over], cost[over],
+                                     demand[over], budget[over])
+    covered = (x * yields).sum(axis=1) >= demand * (1 - 1e-9)
+    return np.where(covered[:, None], x, np.nan)
+
+
+def _budgeted_fill(yields, capacity, cost, demand, budget):
+    """Least gross output meeting demand within budget, by bisecting the budget multiplier."""
+    scale = np.where(cost > 0, cost, np.inf).min(axis=1, keepdims=True)
+    scale = np.where(np.isfinite(scale), scale, 1.0)
+
+    def fill(nu):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keys = yields / (1 + nu * cost / scale)
+        return _greedy_fill(keys, yields, capacity, demand)
+
+    def spend(x):
+        return (x * cost).sum(axis=1)
+
+    # As the multiplier grows the fill tends to the cheapest net energy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cheapest = _greedy_fill(np.where(cost > 0, yields / cost, np.inf), yields, capacity, demand)
+    feasible = spend(cheapest) <= budget * (1 + 1e-12)
+
+    lo = np.zeros((len(demand), 1))
+    hi = np.ones((len(demand), 1))
+    for _ in range(200):
+        grow = (spend(fill(hi)) > budget) & feasible
+        if not grow.any():
+            break
+        hi[grow] *= 2
+    for _ in range(_BUDGET_BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        ok = spend(fill(mid)) <= budget
+        hi = np.where(ok[:, None], mid, hi)
+        lo = np.where(ok[:, None], lo, mid)
+
+    x_lo, x_hi = fill(lo), fill(hi)
+    spend_lo, spend_hi = spend(x_lo), spend(x_hi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        theta = np.clip(np.where(spend_lo > spend_hi, (budget - spend_hi) / (spend_lo - spend_hi), 0.0), 0, 1)
+    x = theta[:, None] * x_lo + (1 - theta[:, None]) * x_hi
+    return np.where(feasible[:, None], x, np.nan)
+
+
+def optimize_supply_mix(consumer: EnergySystem, candidates: Optional[List[SupplyCandidate]] = None,
+                        objective: str = 'eroei', budget: Optional[float] = None,
+                        reserve_margin: float = 0.0) -> EnergySystem:
+    """
+    Power a consumer system from the best mix of generation candidates.
+
+    The demand is the consumer's net energy deficit, grossed up by
+    reserve_margin. With objective='eroei' it is covered with the least
+    gross generation (the highest-EROEI supply mix); with 'net_energy'
+    the budget or capacities are spent on the most net energy. See
+    solve_supply_mix.
+
+    Returns:
+        A new EnergySystem holding the consumer's components plus one
+        supply component per candidate used; each supply component books
+        its whole energy investment as operational input (output/EROEI)
+
+    Raises:
+        ValueError: if no mix within the bounds covers the demand
+    """
+    candidates = candidates if candidates is not None else default_supply_candidates()
+    demand = max(-consumer.net_energy, 0.0) * (1 + reserve_margin)
+    eroei = [c.effective_eroei for c in candidates]
+    x = solve_supply_mix(demand, eroei, [c.max_kwh_year for c in candidates],
+                         [c.cost_per_kwh_year for c in candidates], budget, objective)[0]
+    if np.isnan(x).any():
+        raise ValueError(f"No supply mix within the capacity and budget bounds covers "
+                         f"{demand:,.0f} kWh/year")
+
+    system = EnergySystem(name=f"{consumer.name} + supply mix", components=list(consumer.components))
+    for candidate, output, ratio in zip(candidates, x.tolist(), eroei):
+        if output <= 0:
+            continue
+        system.add_component(EnergyComponent(
+            name=candidate.name or f"{candidate.energy_type.value} supply",
+            component_type=candidate.energy_type,
+            energy_output_kwh_year=output,
+            energy_input_kwh_year=output / ratio,
+            embodied_energy_kwh=0,
+            lifespan_years=1,
+            notes=f"Sized by supply-mix optimizer ({objective}); EROEI {ratio:g} "
+                  f"includes embodied energy"
+        ))
+    return system
+
+
+REPORT_FORMATS = ('json', 'jsonl')
+
+# Characters of output gathered before each write to the stream
+REPORT_BUFFER_CHARS = 1 << 20
+
+_COMPACT_JSON = json.JSONEncoder(separators=(',', ':'), check_circular=False)
+
+
+class BufferedTextWriter:
+    """Collects text and writes it to `stream` in large blocks."""
+
+    def __init__(self, stream: TextIO, buffer_chars: int = REPORT_BUFFER_CHARS):
+        self.stream = stream
+        self.buffer_chars = buffer_chars
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_chars:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts = []
+            self._size = 0
+        self.stream.flush()
+
+
+def write_report(system, stream: TextIO, format: str = 'jsonl', summary_only: bool = False,
+                 extra: Optional[Dict] = None, trailer: Optional[Callable[[], Dict]] = None,
+                 profiler: Optional[PhaseProfiler] = None,
+                 buffer_chars: int = REPORT_BUFFER_CHARS) -> int:
+    """
+    Stream a system analysis without materializing it.
+
+    Component records are generated lazily and encoded one at a time into
+    a BufferedTextWriter, so memory stays flat with millions of
+    components. 'json' writes the analyze() document as compact JSON;
+    'jsonl' writes the summary as {"record": "system", ...}, then one
+    {"record": "component", ...} line per component.
+
+    Args:
+        system: EnergySystem or ColumnarEnergySystem
+        summary_only: Write only the system totals, skipping components
+        extra: Fields added to the summary (e.g. monte_carlo results)
+        trailer: Called after the components; its fields are appended to
+            the JSON document, or written as a final {"record": "trailer"}
+            line (used for timings that cover the write itself)
+
+    Returns:
+        Number of component records written
+    """
+    if format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format {format!r}; expected one of {', '.join(REPORT_FORMATS)}")
+    encode = _COMPACT_JSON.encode
+    out = BufferedTextWriter(stream, buffer_chars)
+    summary = system.summary()
+    summary.update(extra or {})
+    count = 0
+
+    if format == 'jsonl':
+        out.write(encode(dict({'record': 'system'}, **summary)) + '\n')
+    else:
+        head = encode(summary)
+        out.write(head[:-1] if summary_only or len(summary) == 0 else head[:-1] + ',')
+        if not summary_only:
+            out.write('"components":[')
+
+    if not summary_only:
+        size = len(system.components) if isinstance(system, EnergySystem) else len(system)
+        with phase(profiler, 'components', total=size, unit='components') as p:
+            for record in system.iter_component_records(p):
+                if format == 'jsonl':
+                    out.write('{"record":"component",' + encode(record)[1:] + '\n')
+                else:
+                    out.write(encode(record) if count == 0 else ',' + encode(record))
+                count += 1
+        if format == 'json':
+            out.write(']')
+
+    tail = trailer() if trailer is not None else {}
+    if format == 'jsonl':
+        if tail:
+            out.write(encode(dict({'record': 'trailer'}, **tail)) + '\n')
+    else:
+        for key, value in tail.items():
+            out.write(',' + encode(key) + ':' + encode(value))
+        out.write('}\n')
+    out.flush()
+    return count
+
+
+def print_analysis(analysis: Dict, components: Optional[Iterable[Dict]] = None,
+                   stream: Optional[TextIO] = None):
+    """
+    Pretty print system analysis.
+
+    Args:
+        analysis: analyze() or summary() result
+        components: Component records to print instead of
+            analysis['components'], e.g. a lazy iter_component_records();
+            with neither, the breakdown is skipped
+        stream: Destination (stdout by default); output is buffered
+    """
+    out = BufferedTextWriter(stream or sys.stdout)
+    out.write("\n" + "=" * 70 + "\n")
+    out.write(f"ENERGY SYSTEM ANALYSIS: {analysis['system_name']}\n")
+    out.write("=" * 70 + "\n")
+
+    out.write(f"\nTotal Output:           {analysis['total_output_kwh_year']:,.0f} kWh/year\n")
+    out.write(f"Total Input:            {analysis['total_input_kwh_year']:,.0f} kWh/year\n")
+    out.write(f"Net Energy:             {analysis['net_energy_kwh_year']:,.0f} kWh/year\n")
+    out.write(f"\nSystem EROEI:           {analysis['system_eroei']:.2f}\n")
+    out.write(f"Viability:              {analysis['viability_assessment']}\n")
+    out.write(f"Meets 7:1 threshold:    {'YES ✓' if analysis['meets_7_threshold'] else 'NO ✗'}\n")
+    out.write(f"Meets 10:1 threshold:   {'YES ✓' if analysis['meets_10_threshold'] else 'NO ✗'}\n")
+
+    if components is None:
+        components = analysis.get('components')
+    if components is None:
+        out.flush()
+        return
+
+    out.write("\n" + "-" * 70 + "\n")
+    out.write("COMPONENT BREAKDOWN\n")
+    out.write("-" * 70 + "\n")
+
+    for c in components:
+        lines = [f"\n{c['name']} ({c['type']})",
+                 f"  Output:           {c['output_kwh_year']:,.0f} kWh/year",
+                 f"  Operational input: {c['input_kwh_year']:,.0f} kWh/year",
+                 f"  Annualized embodied: {c['annualized_embodied']:,.0f} kWh/year",
+                 f"  Total input:      {c['total_annual_input']:,.0f} kWh/year"]
         if c['component_eroei'] != float('inf'):
-            print(f"  Component EROEI:  {c['component_eroei']:.2f}")
+            lines.append(f"  Component EROEI:  {c['component_eroei']:.2f}")
         else:
-            print(f"  Component EROEI:  N/A (consumer only)")
+            lines.append(f"  Component EROEI:  N/A (consumer only)")
         if c['notes']:
-            print(f"  Notes: {c['notes']}")
+            lines.append(f"  Notes: {c['notes']}")
+        out.write('\n'.join(lines) + '\n')
+    out.flush()
 
 
 def main():
     parser = argparse.ArgumentParser(description='EROEI Calculator')
     parser.add_argument('--config', type=str, help='Load system from JSON config')
+    parser.add_argument('--batch', type=str, metavar='NDJSON',
+                        help="Analyze one system config per line ('-' for stdin), "
+                             "writing one JSON result per line")
+    parser.add_argument('--output', '-o', type=str,
+                        help='Write --batch results, or the --sweep table (.csv or .npy), to this file')
     parser.add_argument('--example', choices=['solar', 'hyphal'], 
                        default='solar', help='Run example system')
     parser.add_argument('--nodes', type=int, default=1000, 
                        help='Number of nodes for hyphal network')
+    parser.add_argument('--sweep', action='store_true',
+                        help='Tabulate hyphal network energy over a grid of nodes, power and overhead')
+    parser.add_argument('--sweep-nodes', type=str, default='100:1000000:61:log',
+                        help="Node counts for --sweep: 'a,b,c', 'start:stop:points' or "
+                             "'start:stop:points:log'")
+    parser.add_argument('--sweep-power', type=str, default='10:500:50',
+                        help='Watts per node for --sweep, same format')
+    parser.add_argument('--sweep-overhead', type=str, default='1.0:2.0:21',
+                        help='Network overhead factors for --sweep, same format')
+    parser.add_argument('--monte-carlo', type=int, metavar='DRAWS',
+                        help='Add EROEI uncertainty from DRAWS Monte Carlo samples (needs NumPy)')
+    parser.add_argument('--seed', type=int, help='Random seed for --monte-carlo')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes for --monte-carlo batches or --batch systems')
+    parser.add_argument('--supply', choices=SUPPLY_OBJECTIVES, nargs='?', const='eroei',
+                        help="Add the generation mix that powers the system, maximizing supply "
+                             "EROEI (default) or net energy; candidates come from the config's "
+                             "'supply_candidates' or REFERENCE_EROEI")
+    parser.add_argument('--budget', type=float,
+                        help='Cost budget for --supply (annual USD with the default candidates)')
+    parser.add_argument('--reserve-margin', type=float, default=0.0,
+                        help='Extra net energy --supply must deliver, as a fraction of demand')
+    parser.add_argument('--sensitivity', type=float, nargs='?', const=0.1, metavar='CHANGE',
+                        help='Add a tornado table for parameters scaled by 1 ± CHANGE (default 0.1)')
+    parser.add_argument('--top', type=int, default=10, help='Rows of the --sensitivity table')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--format', choices=REPORT_FORMATS,
+                        help='Stream the report as compact JSON or JSON lines (to --output or stdout) '
+                             'without building it in memory')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Report system totals only, skipping per-component records')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report per-phase time, memory and throughput; progress on stderr')
     
     args = parser.parse_args()
-    
-    if args.config:
-        with open(args.config, 'r') as f:
-            config = json.load(f)
-        # Parse config into system...
-        print("Config loading not yet implemented")
+    profiler = PhaseProfiler(progress=True) if args.profile else None
+
+    if args.sweep:
+        rows = write_hyphal_sweep(args.output, parse_values(args.sweep_nodes),
+                                  parse_values(args.sweep_power),
+                                  parse_values(args.sweep_overhead), profiler=profiler)
+        if args.output:
+            print(f"Wrote {rows:,} grid points to {args.output}", file=sys.stderr)
+        if profiler is not None:
+            print_phase_table(profiler.report(), stream=sys.stderr)
+        return
+
+    if args.batch:
+        source = sys.stdin if args.batch == '-' else open(args.batch, 'r')
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            with phase(profiler, 'batch', unit='systems') as p:
+                for result in analyze_ndjson(source, workers=args.workers,
+                                             summary_only=args.summary_only):
+                    out.write(json.dumps(result, separators=(',', ':')) + '\n')
+                    p.advance()
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if out is not sys.stdout:
+                out.close()
+        if profiler is not None:
+            print_phase_table(profiler.report(), stream=sys.stderr)
         return
     
-    if args.example == 'solar':
-        system = create_example_solar_system()
-        analysis = system.analyze()
-        
-        if args.json:
-            print(json.dumps(analysis, indent=2))
-        else:
-            print_analysis(analysis)
-            print("\n" + "=" * 70)
-            print("CONCLUSION: This solar system is viable (EROEI > 7)")
-            print("=" * 70)
-    
-    elif args.example == 'hyphal':
-        system = create_hyphal_network_system(num_nodes=args.nodes)
-        analysis = system.analyze()
-        
-        if args.json:
-            print(json.dumps(analysis, indent=2))
+    distributions = None
+    candidates = None
+    with phase(profiler, 'build'):
+        if args.config:
+            try:
+                with open(args.config, 'r') as f:
+                    config = json.load(f)
+                system = system_from_dict(config)
+                distributions = config.get('uncertainty')
+                if 'supply_candidates' in config:
+                    candidates = [supply_candidate_from_dict(c)
+                                  for c in config['supply_candidates']]
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                parser.error(f"{args.config}: {e}")
+        elif args.example == 'solar':
+            system = create_example_solar_system()
         else:
-            print_analysis(analysis)
-            print("\n" + "=" * 70)
-            print("CONCLUSION: Hyphal Network is a PURE CONSUMER")
-            print("")
-            print("This system has EROEI = 0 because it produces no energy.")
-            print("It requires an external energy source (autotrophic layer).")
-            print("")
-            print("To make this viable, you must:")
-            print("1. Specify where the energy comes from (solar, wind, grid?)")
-            print("2. Calculate the EROEI of that source")
-            print("3. Ensure net energy after network costs is positive")
-            print("=" * 70)
+            system = create_hyphal_network_system(num_nodes=args.nodes)
+    if args.supply:
+        if args.supply == 'net_energy' and args.budget is None and candidates is None:
+            parser.error("--supply net_energy needs --budget: the default candidates have "
+                         "unbounded capacity (or give bounded 'supply_candidates' in --config)")
+        with phase(profiler, 'supply'):
+            consumer_components = len(system.components)
+            try:
+                system = optimize_supply_mix(system, candidates, objective=args.supply,
+                                             budget=args.budget, reserve_margin=args.reserve_margin)
+            except (ValueError, ImportError) as e:
+                parser.error(str(e))
+
+    # Sections added after the core analysis, in output order
+    extras = {}
+    if args.supply:
+        supply = system.components[consumer_components:]
+        extras['supply_mix'] = {
+            'objective': args.supply,
+            'supply_eroei': _eroei(sum(c.energy_output_kwh_year for c in supply),
+                                   sum(c.total_annual_input for c in supply)),
+            'sources': [{'name': c.name, 'type': c.component_type.value,
+                         'output_kwh_year': c.energy_output_kwh_year,
+                         'eroei': c.component_eroei} for c in supply],
+        }
+    if args.sensitivity:
+        with phase(profiler, 'sensitivity', total=len(system.components), unit='components'):
+            extras['sensitivity'] = system.sensitivity(args.sensitivity, top=args.top)
+    if args.monte_carlo:
+        extras['monte_carlo'] = monte_carlo_eroei(system, draws=args.monte_carlo,
+                                                  seed=args.seed, workers=args.workers,
+                                                  distributions=distributions,
+                                                  profiler=profiler)
+
+    if args.format:
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            write_report(system, out, args.format, summary_only=args.summary_only, extra=extras,
+                         trailer=(lambda: {'timings': profiler.report()}) if profiler else None,
+                         profiler=profiler)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+
+    if args.json:
+        analysis = system.summary() if args.summary_only else system.analyze(profiler)
+        analysis.update(extras)
+        if profiler is not None:
+            analysis['timings'] = profiler.report()
+        print(json.dumps(analysis, indent=2))
+        return
+
+    analysis = dict(system.summary(), **extras)
+    if args.summary_only:
+        print_analysis(analysis)
+    else:
+        size = len(system.components)
+        with phase(profiler, 'components', total=size, unit='components') as p:
+            print_analysis(analysis, components=system.iter_component_records(p))
+    if 'sensitivity' in analysis:
+        print_tornado(analysis['sensitivity'])
+    if 'monte_carlo' in analysis:
+        print_monte_carlo(analysis['monte_carlo'])
+    if args.supply:
+        mix = analysis['supply_mix']
+        print("\n" + "=" * 70)
+        print(f"SUPPLY MIX ({mix['objective']}): supply EROEI {mix['supply_eroei']:.2f}")
+        for source in mix['sources']:
+            print(f"  {source['name']:<32} {source['output_kwh_year']:>16,.0f} kWh/year  "
+                  f"(EROEI {source['eroei']:.1f})")
+        print("")
+        print("System EROEI counts the consumer's demand as input, so a mix that")
+        print("exactly covers it shows EROEI ≈ 1; surplus shows as net energy.")
+        print("=" * 70)
+    elif not args.config and args.example == 'solar':
+        print("\n" + "=" * 70)
+        print("CONCLUSION: This solar system is viable (EROEI > 7)")
+        print("=" * 70)
+    elif not args.config:
+        print("\n" + "=" * 70)
+        print("CONCLUSION: Hyphal Network is a PURE CONSUMER")
+        print("")
+        print("This system has EROEI = 0 because it produces no energy.")
+        print("It requires an external energy source (autotrophic layer).")
+        print("")
+        print("To make this viable, you must:")
+        print("1. Specify where the energy comes from (solar, wind, grid?)")
+        print("2. Calculate the EROEI of that source")
+        print("3. Ensure net energy after network costs is positive")
+        print("=" * 70)
+    if profiler is not None:
+        print_phase_table(profiler.report())
 
 
 if __name__ == '__main__':
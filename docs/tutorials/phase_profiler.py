@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Phase Profiler
+
+Phase-level timing, memory and throughput instrumentation shared by the
+thermodynamic-economics scripts (small_world_metrics.py,
+eroei_calculator.py). Part of the thermodynamic-economics skill for
+Univrs.io.
+
+Usage:
+    profiler = PhaseProfiler(progress=True)
+    with profiler.phase('L', total=n, unit='sources') as p:
+        for batch in batches:
+            ...
+            p.advance(len(batch))
+    print(profiler.report())
+
+Hooks are callables hook(event, info) with event one of 'phase_start',
+'progress' or 'phase_end'; info is the phase record so far.
+"""
+
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, List, Optional, TextIO
+
+Hook = Callable[[str, Dict], None]
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MiB (peak RSS where unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Phase:
+    """A running phase; call advance() as work items complete."""
+
+    def __init__(self, profiler: 'PhaseProfiler', name: str, total: Optional[int], unit: str):
+        self.profiler = profiler
+        self.name = name
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self.started = time.perf_counter()
+        self.rss_start = current_rss_mb()
+        self._last_report = self.started
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def info(self) -> Dict:
+        elapsed = self.elapsed()
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total and self.done and rate > 0:
+            eta = max(self.total - self.done, 0) / rate
+        return {'name': self.name, 'done': self.done, 'total': self.total,
+                'unit': self.unit, 'elapsed': elapsed, 'rate': rate, 'eta': eta}
+
+    def advance(self, n: int = 1):
+        self.done += n
+        now = time.perf_counter()
+        if now - self._last_report >= self.profiler.interval:
+            self._last_report = now
+            self.profiler._emit('progress', self.info())
+
+
+class PhaseProfiler:
+    """
+    Records elapsed time, RSS delta and throughput for named phases.
+
+    Args:
+        progress: Print periodic progress with ETA to `stream`
+        interval: Seconds between progress events
+        hooks: Callables hook(event, info) notified of phase events
+        stream: Destination for progress lines (stderr by default)
+    """
+
+    def __init__(self, progress: bool = False, interval: float = 2.0,
+                 hooks: Optional[List[Hook]] = None, stream: Optional[TextIO] = None):
+        self.interval = interval
+        self.hooks: List[Hook] = list(hooks or [])
+        self.stream = stream or sys.stderr
+        self.records: List[Dict] = []
+        self.started = time.perf_counter()
+        if progress:
+            self.hooks.append(self._print_progress)
+
+    def add_hook(self, hook: Hook):
+        self.hooks.append(hook)
+
+    def _emit(self, event: str, info: Dict):
+        for hook in self.hooks:
+            hook(event, info)
+
+    @contextmanager
+    def phase(self, name: str, total: Optional[int] = None, unit: str = 'items'):
+        """Time a phase; `total` work items of `unit` enable rate and ETA."""
+        current = Phase(self, name, total, unit)
+        self._emit('phase_start', current.info())
+        try:
+            yield current
+        finally:
+            if current.done == 0 and total:
+                # Phases without intermediate progress still report throughput
+                current.done = total
+            record = current.info()
+            record.pop('eta')
+            record['seconds'] = record.pop('elapsed')
+            record['rss_delta_mb'] = current_rss_mb() - current.rss_start
+            self.records.append(record)
+            self._emit('phase_end', record)
+
+    def report(self) -> Dict:
+        """Phase records plus total wall time, suitable for JSON output."""
+        return {'phases': list(self.records),
+                'total_seconds': time.perf_counter() - self.started}
+
+    def _print_progress(self, event: str, info: Dict):
+        if event == 'phase_start':
+            print(f"[{info['name']}] started", file=self.stream, flush=True)
+        elif event == 'progress':
+            done = f"{info['done']:,}"
+            if info['total']:
+                done += f"/{info['total']:,} ({info['done'] / info['total']:.1%})"
+            eta = f" ETA {format_duration(info['eta'])}" if info['eta'] is not None else ""
+            print(f"[{info['name']}] {done} {info['unit']} {info['rate']:,.1f} {info['unit']}/s{eta}",
+                  file=self.stream, flush=True)
+        elif event == 'phase_end':
+            print(f"[{info['name']}] done in {info['seconds']:.2f}s "
+                  f"({info['rate']:,.1f} {info['unit']}/s, ΔRSS {info['rss_delta_mb']:+.1f} MiB)",
+                  file=self.stream, flush=True)
+
+
+class _NullPhase:
+    def advance(self, n: int = 1):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(profiler: Optional[PhaseProfiler], name: str, total: Optional[int] = None,
+          unit: str = 'items'):
+    """profiler.phase(...) or a no-op context when profiling is off."""
+    if profiler is None:
+        return nullcontext(_NULL_PHASE)
+    return profiler.phase(name, total=total, unit=unit)
+
+
+def print_phase_table(report: Dict, stream: Optional[TextIO] = None):
+    """Pretty print a PhaseProfiler report."""
+    stream = stream or sys.stdout
+    print("\n" + "-" * 60, file=stream)
+    print("PHASE TIMINGS", file=stream)
+    print("-" * 60, file=stream)
+    for r in report['phases']:
+        print(f"{r['name']:<18} {r['seconds']:>9.3f} s  {r['rss_delta_mb']:>+8.1f} MiB  "
+              f"{r['rate']:>12,.1f} {r['unit']}/s", file=stream)
+    print(f"{'total':<18} {report['total_seconds']:>9.3f} s", file=stream)
@@ -8,14 +8,49 @@ Part of the thermodynamic-economics skill for Univrs.io.
 Usage:
     python small_world_metrics.py --nodes 1000 --degree 10 --rewire 0.1
     python small_world_metrics.py --edgelist network.csv
+    python small_world_metrics.py --edgelist network.csv --save-graph network.csr --convert
+    python small_world_metrics.py --edgelist network.csr
+    python small_world_metrics.py --edgelist latency.csv --weighted
+    python small_world_metrics.py --nodes 100000 --degree 10 --compact
+    python small_world_metrics.py --nodes 50000 --degree 10 --workers 8
+    python small_world_metrics.py --nodes 50000 --degree 10 --approx --time-budget 60
+    python small_world_metrics.py --nodes 5000 --baselines 8 --workers 8 --cache-dir ~/.cache/sw
+    python small_world_metrics.py --nodes 20000 --degree 10 --compact --profile
+    python small_world_metrics.py --batch 'snapshots/*.csv' --workers 8 -o report.jsonl
+    python small_world_metrics.py --nodes 1000 --degree 10 --sweep --sweep-seeds 5 --workers 8 -o sweep.csv
 """
 
 import argparse
+import csv
+import glob
+import hashlib
 import json
+import io
 import math
+import mmap
+import os
 from collections import deque
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import random
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from statistics import NormalDist, mean, stdev
+
+from phase_profiler import PhaseProfiler, phase, print_phase_table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy(feature: str):
+    """Raise a helpful error when an array-backed feature is used without NumPy."""
+    if np is None:
+        raise ImportError(f"{feature} requires NumPy (pip install numpy)")
+
 
 class Graph:
     """Simple graph implementation for metric calculation."""
@@ -32,6 +67,15 @@ class Graph:
         self.add_node(v)
         self.adj[u].add(v)
         self.adj[v].add(u)
+
+    def remove_edge(self, u: int, v: int):
+        if u in self.adj:
+            self.adj[u].discard(v)
+        if v in self.adj:
+            self.adj[v].discard(u)
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return v in self.adj.get(u, ())
         
     def nodes(self) -> List[int]:
         return list(self.adj.keys())
@@ -52,6 +96,225 @@ class Graph:
     def neighbors(self, n: int) -> set:
         return self.adj.get(n, set())
 
+    def number_of_nodes(self) -> int:
+        return len(self.adj)
+
+    def number_of_edges(self) -> int:
+        ends = sum(len(nbrs) for nbrs in self.adj.values())
+        loops = sum(1 for u, nbrs in self.adj.items() if u in nbrs)
+        return (ends + loops) // 2
+
+    def copy(self) -> 'Graph':
+        g = Graph()
+        g.adj = {u: set(nbrs) for u, nbrs in self.adj.items()}
+        return g
+
+    def freeze(self) -> 'CompactGraph':
+        """Return an immutable array-backed copy of this graph."""
+        return CompactGraph.from_graph(self)
+
+
+def _index_dtype(n: int):
+    """Smallest signed integer dtype able to hold node indices 0..n-1."""
+    return np.int32 if n < 2**31 else np.int64
+
+
+def _sorted_unique(values):
+    """Sorted distinct values of a 1-D array (sort + mask, cheaper than np.unique)."""
+    values = np.sort(values)
+    if values.size:
+        keep = np.empty(values.size, dtype=bool)
+        keep[0] = True
+        np.not_equal(values[1:], values[:-1], out=keep[1:])
+        values = values[keep]
+    return values
+
+
+def _adjacency_positions(indptr, nodes):
+    """Positions in indices of the adjacency lists of `nodes`, and their lengths."""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    # Offset of each output slot within its own adjacency list
+    offsets = np.arange(total, dtype=np.int64)
+    offsets -= np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets, lengths
+
+
+def _check_edge_weights(weights, source: str = 'Edge weights'):
+    """Reject weights that shortest-path search cannot handle (<= 0, inf, nan)."""
+    bad = np.flatnonzero(~(np.isfinite(weights) & (weights > 0)))
+    if bad.size:
+        raise ValueError(f"{source}: edge weights must be positive and finite; "
+                         f"{bad.size} are not (first: {float(weights[bad[0]])})")
+
+
+def _gather_neighbors(indptr, indices, nodes):
+    """Concatenate the adjacency lists of `nodes` into one array."""
+    return indices[_adjacency_positions(indptr, nodes)[0]]
+
+
+class CompactGraph:
+    """
+    Immutable graph in compressed sparse row (CSR) form.
+
+    The neighbors of node i are indices[indptr[i]:indptr[i + 1]], sorted
+    ascending, so an undirected edge costs two index entries (8 bytes with
+    int32 indices) instead of two Python set entries. Nodes are numbered
+    0..n-1; when the source graph used other node ids, labels[i] holds the
+    original id of node i. Self-loops are dropped. An optional weights
+    array, aligned with indices, holds a positive length (e.g. latency)
+    for each directed adjacency entry.
+    """
+
+    def __init__(self, indptr, indices, labels=None, weights=None):
+        _require_numpy("CompactGraph")
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices)
+        self.labels = None if labels is None else np.asarray(labels)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+
+    @property
+    def weighted(self) -> bool:
+        return self.weights is not None
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> 'CompactGraph':
+        """Freeze a mutable Graph, relabelling nodes to 0..n-1 in id order."""
+        _require_numpy("CompactGraph")
+        labels = sorted(g.adj)
+        n = len(labels)
+        identity = labels == list(range(n))
+        index = None if identity else {v: i for i, v in enumerate(labels)}
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices = []
+        for i, v in enumerate(labels):
+            nbrs = g.adj[v] if identity else [index[u] for u in g.adj[v]]
+            nbrs = sorted(u for u in nbrs if u != i)
+            indices.extend(nbrs)
+            indptr[i + 1] = indptr[i] + len(nbrs)
+
+        return cls(indptr, np.asarray(indices, dtype=_index_dtype(n)),
+                   None if identity else labels)
+
+    @classmethod
+    def from_edges(cls, u, v, num_nodes: Optional[int] = None, weights=None) -> 'CompactGraph':
+        """
+        Build from parallel arrays of edge endpoints.
+
+        Args:
+            u, v: Edge endpoints; duplicates and reversed pairs are merged
+            num_nodes: If given, endpoints are taken as indices 0..num_nodes-1
+                and isolated nodes are kept; otherwise the distinct ids in
+                u and v become the nodes
+            weights: Optional edge lengths; merged duplicates keep the
+                smallest
+
+        Returns:
+            CompactGraph with symmetric, sorted adjacency
+        """
+        _require_numpy("CompactGraph")
+        u = np.asarray(u, dtype=np.int64).ravel()
+        v = np.asarray(v, dtype=np.int64).ravel()
+        labels = None
+        if num_nodes is None:
+            ids = _sorted_unique(np.concatenate([u, v]))
+            u, v = np.searchsorted(ids, u), np.searchsorted(ids, v)
+            n = len(ids)
+            if n and (ids[0] != 0 or ids[-1] != n - 1):
+                labels = ids
+        else:
+            n = num_nodes
+
+        keep = u != v
+        u, v = u[keep], v[keep]
+        # Encode each directed edge as src * n + dst; sorting orders by
+        # source then target, and dropping repeats merges duplicates.
+        keys = np.concatenate([u * n + v, v * n + u])
+        if weights is None:
+            keys = _sorted_unique(keys)
+        else:
+            w = np.asarray(weights, dtype=np.float64).ravel()[keep]
+            _check_edge_weights(w)
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            w = np.concatenate([w, w])[order]
+            first = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if keys.size else order
+            keys = keys[first]
+            weights = np.minimum.reduceat(w, first) if keys.size else w
+        src, dst = np.divmod(keys, n) if n else (keys, keys)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(indptr, dst.astype(_index_dtype(n)), labels, weights)
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def nodes(self) -> List[int]:
+        return list(range(self.number_of_nodes()))
+
+    def edge_array(self) -> Tuple:
+        """Return (u, v) index arrays with u < v, one entry per edge."""
+        src = np.repeat(np.arange(self.number_of_nodes(), dtype=self.indices.dtype),
+                        np.diff(self.indptr))
+        upper = src < self.indices
+        return src[upper], self.indices[upper]
+
+    def edge_weights(self):
+        """Weights of the edges returned by edge_array, in the same order."""
+        src = np.repeat(np.arange(self.number_of_nodes(), dtype=self.indices.dtype),
+                        np.diff(self.indptr))
+        return self.weights[src < self.indices]
+
+    def with_edge_weights(self, weights) -> 'CompactGraph':
+        """Copy of this graph with `weights` assigned to edge_array() edges."""
+        u, v = self.edge_array()
+        g = CompactGraph.from_edges(u, v, num_nodes=self.number_of_nodes(), weights=weights)
+        g.labels = self.labels
+        return g
+
+    def edges(self) -> List[Tuple[int, int]]:
+        u, v = self.edge_array()
+        return list(zip(u.tolist(), v.tolist()))
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    def index_of(self, ids):
+        """Map original node ids to node indices."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.labels is None:
+            return ids
+        return np.searchsorted(self.labels, ids)
+
+    def degree(self, n: int) -> int:
+        return int(self.indptr[n + 1] - self.indptr[n])
+
+    def neighbors(self, n: int):
+        return self.indices[self.indptr[n]:self.indptr[n + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the adjacency arrays."""
+        extra = self.labels.nbytes if self.labels is not None else 0
+        extra += self.weights.nbytes if self.weights is not None else 0
+        return self.indptr.nbytes + self.indices.nbytes + extra
+
+    def to_graph(self) -> Graph:
+        """Thaw into a mutable Graph, restoring original node ids."""
+        g = Graph()
+        ids = self.labels.tolist() if self.labels is not None else None
+        for i in range(self.number_of_nodes()):
+            g.add_node(ids[i] if ids else i)
+        for a, b in self.edges():
+            g.add_edge(ids[a] if ids else a, ids[b] if ids else b)
+        return g
+
 
 def create_ring_lattice(n: int, k: int) -> Graph:
     """Create a ring lattice with n nodes, each connected to k nearest neighbors."""
@@ -68,7 +331,8 @@ def create_ring_lattice(n: int, k: int) -> Graph:
     return g
 
 
-def watts_strogatz(n: int, k: int, p: float, seed: Optional[int] = None) -> Graph:
+def watts_strogatz(n: int, k: int, p: float, seed: Optional[int] = None,
+                   lattice: Optional[Graph] = None) -> Graph:
     """
     Create a Watts-Strogatz small-world graph.
     
@@ -77,55 +341,352 @@ def watts_strogatz(n: int, k: int, p: float, seed: Optional[int] = None) -> Grap
         k: Each node is connected to k nearest neighbors in ring topology
         p: Probability of rewiring each edge
         seed: Random seed for reproducibility
+        lattice: Prebuilt create_ring_lattice(n, k) to copy instead of
+            rebuilding it, e.g. across a parameter sweep
     
     Returns:
         Small-world graph
+
+    Rewiring draws the new target by rejection sampling: uniform node
+    draws are retried until they are neither i nor already adjacent to i,
+    which yields the same uniform choice over valid targets as scanning
+    all candidates, in O(1) expected draws for sparse graphs. A private
+    random.Random is used, so concurrent generators do not share state.
     """
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
     
-    g = create_ring_lattice(n, k)
-    nodes = list(range(n))
+    g = lattice.copy() if lattice is not None else create_ring_lattice(n, k)
     
     # Rewire edges
     for i in range(n):
         for j in range(1, k // 2 + 1):
-            if random.random() < p:
+            if rng.random() < p:
                 # Remove old edge
                 old_target = (i + j) % n
                 g.adj[i].discard(old_target)
                 g.adj[old_target].discard(i)
                 
                 # Add new random edge (avoid self-loops and duplicates)
-                candidates = [x for x in nodes if x != i and x not in g.adj[i]]
-                if candidates:
-                    new_target = random.choice(candidates)
+                if len(g.adj[i]) < n - 1:
+                    new_target = rng.randrange(n)
+                    while new_target == i or new_target in g.adj[i]:
+                        new_target = rng.randrange(n)
                     g.add_edge(i, new_target)
     
     return g
 
 
-def erdos_renyi(n: int, m: int, seed: Optional[int] = None) -> Graph:
-    """Create an Erdős-Rényi random graph with n nodes and m edges."""
-    if seed is not None:
-        random.seed(seed)
+def _sample_pair_indices(total: int, m: int, seed: Optional[int]):
+    """
+    Draw m distinct integers from range(total) uniformly, in O(m) memory.
+
+    Uses batched hash/sort rejection with NumPy (a Python set otherwise).
+    When m exceeds half of total the complement is sampled instead, so the
+    number of rejected draws stays bounded.
+    """
+    if 2 * m > total:
+        excluded = _sample_pair_indices(total, total - m, seed)
+        if np is not None:
+            return np.setdiff1d(np.arange(total, dtype=np.int64), excluded, assume_unique=True)
+        excluded = set(excluded)
+        return [x for x in range(total) if x not in excluded]
+
+    if np is None:
+        rng = random.Random(seed)
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(rng.randrange(total))
+        return sorted(chosen)
+
+    rng = np.random.default_rng(seed)
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < m:
+        missing = m - len(chosen)
+        draws = rng.integers(0, total, size=missing + missing // 10 + 16, dtype=np.int64)
+        chosen = _sorted_unique(np.concatenate([chosen, draws]))
+    if len(chosen) > m:
+        # A uniform m-subset of a uniformly drawn superset is still uniform
+        chosen = np.delete(chosen, rng.choice(len(chosen), size=len(chosen) - m, replace=False))
+    return chosen
+
+
+def _decode_pairs(idx):
+    """Map pair index j*(j-1)/2 + i (i < j) back to node pairs (i, j)."""
+    if np is not None:
+        idx = np.asarray(idx, dtype=np.int64)
+        j = ((1 + np.sqrt(1 + 8 * idx.astype(np.float64))) // 2).astype(np.int64)
+        # Correct float rounding, which is at most one step either way
+        j -= j * (j - 1) // 2 > idx
+        j += (j + 1) * j // 2 <= idx
+        return idx - j * (j - 1) // 2, j
+    js = [(1 + math.isqrt(1 + 8 * x)) // 2 for x in idx]
+    return [x - j * (j - 1) // 2 for x, j in zip(idx, js)], js
+
+
+def erdos_renyi(n: int, m: int, seed: Optional[int] = None,
+                compact: bool = False) -> Graph:
+    """
+    Create an Erdős-Rényi G(n, m) random graph with n nodes and m edges.
+
+    Edges are drawn as m distinct indices into the n(n-1)/2 possible
+    pairs, so memory is O(m) rather than O(n²). With compact=True the
+    result is built directly as a CompactGraph without an intermediate
+    Graph. The same seed gives the same edges in both forms.
+    """
+    total = n * (n - 1) // 2
+    m = min(m, total)
+    u, v = _decode_pairs(_sample_pair_indices(total, m, seed))
+
+    if compact:
+        return CompactGraph.from_edges(u, v, num_nodes=n)
     
     g = Graph()
     for i in range(n):
         g.add_node(i)
     
-    # All possible edges
-    possible = [(i, j) for i in range(n) for j in range(i + 1, n)]
-    random.shuffle(possible)
-    
-    for u, v in possible[:m]:
-        g.add_edge(u, v)
+    if np is not None:
+        u, v = u.tolist(), v.tolist()
+    for a, b in zip(u, v):
+        g.add_edge(a, b)
     
     return g
 
 
+# Bytes of edge-list text parsed per chunk
+EDGELIST_CHUNK_BYTES = 64 << 20
+
+# Binary CSR file: magic, little-endian uint64 header length, JSON header,
+# then each array at a 64-byte aligned offset so it can be memory-mapped
+GRAPH_FILE_MAGIC = b'KRZYCSR1'
+_GRAPH_FILE_ALIGN = 64
+
+
+def _edgelist_chunks(path: str, chunk_bytes: int):
+    """Yield newline-aligned byte chunks of a file through mmap."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = min(start + chunk_bytes, size)
+                if end < size:
+                    newline = mm.rfind(b'\n', start, end)
+                    end = newline + 1 if newline >= start else mm.find(b'\n', end) + 1 or size
+                yield mm[start:end]
+                start = end
+
+
+def _edge_dtype(weighted: bool):
+    """Row dtype of a parsed edge list: int64 endpoints, plus a float64 weight."""
+    if weighted:
+        return np.dtype([('u', np.int64), ('v', np.int64), ('w', np.float64)])
+    return np.dtype([('u', np.int64), ('v', np.int64)])
+
+
+def _parse_edge_lines(text: str, weighted: bool, path: str, first_line: int):
+    """
+    Line-by-line parse of a chunk np.loadtxt rejected. Lines with fewer
+    than two fields are skipped, as the set-based loader does; a weighted
+    list must give every edge as 'u,v,w'. `first_line` is the file line
+    number of the chunk's first line, for error messages.
+    """
+    rows = []
+    for lineno, line in enumerate(text.splitlines(), first_line):
+        content = line.split('#', 1)[0].strip()
+        if not content:
+            continue
+        parts = content.split(',')
+        if weighted and len(parts) < 3:
+            raise ValueError(f"{path}:{lineno}: expected 'u,v,w'")
+        if len(parts) < 2:
+            continue
+        try:
+            row = (int(parts[0]), int(parts[1]))
+            rows.append(row + (float(parts[2]),) if weighted else row)
+        except ValueError:
+            raise ValueError(f"{path}:{lineno}: cannot parse edge list line {line.strip()!r}") from None
+    return np.array(rows, dtype=_edge_dtype(weighted))
+
+
+def read_edgelist(path: str, chunk_bytes: int = EDGELIST_CHUNK_BYTES,
+                  weighted: bool = False) -> Tuple:
+    """
+    Parse a comma-separated edge list into endpoint arrays.
+
+    The file is memory-mapped and parsed in newline-aligned chunks with
+    NumPy's C text parser, so only one chunk of text is held at a time.
+    Lines starting with '#' and blank lines are skipped; columns after
+    the first two (three when weighted) are ignored. A chunk with lines
+    of too few columns is reparsed line by line: unweighted, those lines
+    are skipped; weighted, a line without a third column is an error.
+
+    Returns:
+        (u, v) int64 arrays of edge endpoints, plus a float64 array of
+        third-column weights when weighted
+    """
+    _require_numpy("read_edgelist")
+    dtype = _edge_dtype(weighted)
+    parts = []
+    first_line = 1
+    for chunk in _edgelist_chunks(path, chunk_bytes):
+        text = chunk.decode()
+        try:
+            with warnings.catch_warnings():
+                # A chunk holding only comments is fine; don't warn about it
+                warnings.simplefilter('ignore', UserWarning)
+                # Unweighted rows parse fastest as a plain int64 matrix
+                rows = np.loadtxt(io.StringIO(text), delimiter=',', comments='#',
+                                  usecols=tuple(range(len(dtype))),
+                                  dtype=dtype if weighted else np.int64,
+                                  ndmin=1 if weighted else 2)
+            columns = [rows[name] for name in dtype.names] if weighted else list(rows.T)
+        except ValueError:
+            columns = None
+        if columns is None:
+            rows = _parse_edge_lines(text, weighted, path, first_line)
+            columns = [rows[name] for name in dtype.names]
+        parts.append(columns)
+        first_line += text.count('\n')
+    if not parts:
+        return tuple(np.empty(0, dtype=dtype[name]) for name in dtype.names)
+    return tuple(np.concatenate([p[i] for p in parts]) for i in range(len(dtype)))
+
+
+def load_edgelist(path: str, weighted: bool = False) -> Graph:
+    """
+    Load an edge-list CSV, as a CompactGraph when NumPy is available.
+
+    With weighted=True the third column is read as the edge length
+    (e.g. link latency). Without NumPy the file is read line by line into
+    an unweighted Graph. A file with no edges raises ValueError.
+    """
+    if np is not None:
+        if weighted:
+            u, v, w = read_edgelist(path, weighted=True)
+            _check_edge_weights(w, path)
+        else:
+            u, v = read_edgelist(path)
+            w = None
+        if u.size == 0:
+            raise ValueError(f"{path}: no edges found")
+        return CompactGraph.from_edges(u, v, weights=w)
+    if weighted:
+        _require_numpy("Weighted edge lists")
+
+    g = Graph()
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                parts = line.split(',')
+                if len(parts) >= 2:
+                    g.add_edge(int(parts[0]), int(parts[1]))
+    if g.number_of_nodes() == 0:
+        raise ValueError(f"{path}: no edges found")
+    return g
+
+
+def save_graph(g: Graph, path: str):
+    """Write a graph in the binary CSR format read by load_graph."""
+    if not isinstance(g, CompactGraph):
+        g = g.freeze()
+    arrays = {'indptr': g.indptr, 'indices': g.indices}
+    if g.labels is not None:
+        arrays['labels'] = g.labels
+    if g.weights is not None:
+        arrays['weights'] = g.weights
+
+    # Header size depends on the offsets it records, so size it first
+    # with placeholder offsets wide enough for any file
+    layout = {name: {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': 2**62}
+              for name, arr in arrays.items()}
+    header_len = len(json.dumps({'arrays': layout}).encode())
+    offset = -(-(len(GRAPH_FILE_MAGIC) + 8 + header_len) // _GRAPH_FILE_ALIGN) * _GRAPH_FILE_ALIGN
+    for name, arr in arrays.items():
+        layout[name]['offset'] = offset
+        offset += -(-max(arr.nbytes, 1) // _GRAPH_FILE_ALIGN) * _GRAPH_FILE_ALIGN
+    header = json.dumps({'arrays': layout}).encode().ljust(header_len)
+
+    with open(path, 'wb') as f:
+        f.write(GRAPH_FILE_MAGIC)
+        f.write(np.uint64(header_len).astype('<u8').tobytes())
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(layout[name]['offset'])
+            f.write(np.ascontiguousarray(arr).tobytes())
+        f.truncate(offset)
+
+
+def is_graph_file(path: str) -> bool:
+    """True if `path` starts with the binary CSR magic."""
+    with open(path, 'rb') as f:
+        return f.read(len(GRAPH_FILE_MAGIC)) == GRAPH_FILE_MAGIC
+
+
+def load_graph_file(path: str, weighted: bool = False) -> Graph:
+    """
+    Load a binary CSR graph or an edge-list CSV, detected by content.
+
+    Binary files keep whatever weights they were saved with; `weighted`
+    applies to CSV input only.
+    """
+    if is_graph_file(path):
+        return load_graph(path)
+    return load_edgelist(path, weighted=weighted)
+
+
+def load_graph(path: str, mmap_mode: Optional[str] = 'r') -> 'CompactGraph':
+    """
+    Open a binary CSR graph written by save_graph.
+
+    With the default mmap_mode the arrays are memory-mapped, so opening is
+    near-instant and pages are read on demand; pass None to load eagerly.
+    """
+    _require_numpy("load_graph")
+    with open(path, 'rb') as f:
+        if f.read(len(GRAPH_FILE_MAGIC)) != GRAPH_FILE_MAGIC:
+            raise ValueError(f"{path} is not a binary CSR graph file")
+        header_len = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        layout = json.loads(f.read(header_len))['arrays']
+
+    arrays = {}
+    for name, spec in layout.items():
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(spec['shape'])
+        if mmap_mode is None or math.prod(shape) == 0:
+            arrays[name] = np.fromfile(path, dtype=dtype, count=math.prod(shape),
+                                       offset=spec['offset']).reshape(shape)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode=mmap_mode,
+                                     offset=spec['offset'], shape=shape)
+    return CompactGraph(arrays['indptr'], arrays['indices'], arrays.get('labels'),
+                        arrays.get('weights'))
+
+
+def _csr_bfs(indptr, indices, source: int):
+    """Level-synchronous BFS over CSR arrays; -1 marks unreachable nodes."""
+    dist = np.full(len(indptr) - 1, -1, dtype=np.int32)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    depth = 0
+    while frontier.size:
+        depth += 1
+        nbrs = _gather_neighbors(indptr, indices, frontier)
+        nbrs = _sorted_unique(nbrs[dist[nbrs] < 0])
+        dist[nbrs] = depth
+        frontier = nbrs
+    return dist
+
+
 def shortest_path_lengths(g: Graph, source: int) -> Dict[int, int]:
     """BFS to find shortest paths from source to all nodes."""
+    if isinstance(g, CompactGraph):
+        dist = _csr_bfs(g.indptr, g.indices, source)
+        reached = np.flatnonzero(dist >= 0)
+        return dict(zip(reached.tolist(), dist[reached].tolist()))
+
     dist = {source: 0}
     queue = deque([source])
     
@@ -139,8 +700,587 @@ def shortest_path_lengths(g: Graph, source: int) -> Dict[int, int]:
     return dist
 
 
-def average_path_length(g: Graph) -> float:
-    """Calculate average shortest path length."""
+# Sources handled per pass of the bit-parallel engine, in 64-bit words
+BITSET_WORDS = 4
+
+# Hop-count engines; 'weighted' is selected by weighted analysis instead
+HOP_ENGINES = ('bfs', 'bitset')
+PATH_ENGINES = HOP_ENGINES + ('weighted',)
+
+
+def _bitset_source_path_sums(g: 'CompactGraph', sources,
+                             words: int = BITSET_WORDS) -> Tuple[List[int], List[int]]:
+    """
+    Multi-source BFS with one bit per source in uint64 words per node.
+
+    Each pass runs up to 64 * words sources at once: a level expands every
+    frontier simultaneously by OR-ing the frontier bits of each node's
+    neighbors, so the Python-level work is per level rather than per
+    source and per edge.
+    """
+    indptr, indices = g.indptr, g.indices
+    n = g.number_of_nodes()
+    with_edges = np.flatnonzero(np.diff(indptr) > 0)
+    segment_starts = indptr[with_edges]
+    width = 64 * words
+
+    totals = []
+    counts = []
+    sources = np.asarray(sources, dtype=np.int64)
+    for start in range(0, len(sources), width):
+        block = sources[start:start + width]
+        bits = np.arange(len(block))
+        frontier = np.zeros((n, words), dtype=np.uint64)
+        np.bitwise_or.at(frontier, (block, bits // 64),
+                         np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)))
+        visited = frontier.copy()
+
+        block_totals = np.zeros(width, dtype=np.int64)
+        block_counts = np.zeros(width, dtype=np.int64)
+        depth = 0
+        while True:
+            depth += 1
+            reached = np.zeros_like(frontier)
+            if len(with_edges):
+                reached[with_edges] = np.bitwise_or.reduceat(frontier[indices], segment_starts,
+                                                             axis=0)
+            reached &= ~visited
+            active = np.flatnonzero(reached.any(axis=1))
+            if active.size == 0:
+                break
+            visited[active] |= reached[active]
+            # Bit j of word w is source w * 64 + j once unpacked little-endian
+            per_source = np.unpackbits(reached[active].astype('<u8').view(np.uint8),
+                                       axis=1, bitorder='little').sum(axis=0, dtype=np.int64)
+            block_counts += per_source
+            block_totals += depth * per_source
+            frontier = reached
+
+        totals.extend(block_totals[:len(block)].tolist())
+        counts.extend(block_counts[:len(block)].tolist())
+    return totals, counts
+
+
+def _csr_delta_stepping(indptr, indices, weights, source: int, delta: float):
+    """
+    Weighted single-source shortest paths by vectorized delta-stepping.
+
+    Active nodes are settled bucket by bucket: each round relaxes every
+    edge out of the active nodes whose tentative distance lies within
+    `delta` of the smallest one, and any node whose distance drops is
+    re-activated. Small delta approaches Dijkstra's order, large delta a
+    frontier Bellman-Ford; either way the result is exact for positive
+    weights. Returns distances with inf for unreachable nodes.
+    """
+    if not delta > 0:
+        raise ValueError(f"Delta-stepping needs a positive bucket width, got {delta!r}")
+    dist = np.full(len(indptr) - 1, np.inf)
+    dist[source] = 0.0
+    active = np.array([source], dtype=np.int64)
+    while active.size:
+        d_active = dist[active]
+        bucket = d_active < d_active.min() + delta
+        settle, active = active[bucket], active[~bucket]
+
+        positions, lengths = _adjacency_positions(indptr, settle)
+        targets = indices[positions]
+        candidate = np.repeat(dist[settle], lengths) + weights[positions]
+        better = candidate < dist[targets]
+        if not better.any():
+            continue
+        targets, candidate = targets[better], candidate[better]
+        np.minimum.at(dist, targets, candidate)
+        active = _sorted_unique(np.concatenate([active, targets]))
+    return dist
+
+
+def _weighted_source_path_sums(g: 'CompactGraph', sources) -> Tuple[List[float], List[int]]:
+    """Per-source sum of weighted distances and number of reachable targets."""
+    if getattr(g, 'weights', None) is None:
+        raise ValueError("The 'weighted' engine needs a CompactGraph with edge weights")
+    _check_edge_weights(g.weights)
+    delta = float(g.weights.mean()) if g.weights.size else 1.0
+    totals = []
+    counts = []
+    for source in sources:
+        dist = _csr_delta_stepping(g.indptr, g.indices, g.weights, int(source), delta)
+        finite = np.isfinite(dist)
+        finite[source] = False
+        reached = dist[finite]
+        totals.append(float(reached.sum()))
+        counts.append(reached.size)
+    return totals, counts
+
+
+def _source_path_sums(g: Graph, sources, engine: str = 'bfs') -> Tuple[List[int], List[int]]:
+    """Per-source sum of distances and number of reachable targets."""
+    if engine == 'bitset':
+        return _bitset_source_path_sums(g, sources)
+    if engine == 'weighted':
+        return _weighted_source_path_sums(g, sources)
+
+    totals = []
+    counts = []
+    for source in sources:
+        if isinstance(g, CompactGraph):
+            dist = _csr_bfs(g.indptr, g.indices, int(source))
+            dist[source] = -1
+            reached = dist[dist >= 0]
+            totals.append(int(reached.sum(dtype=np.int64)))
+            counts.append(reached.size)
+        else:
+            dists = shortest_path_lengths(g, source)
+            totals.append(sum(dists.values()))
+            counts.append(len(dists) - 1)
+    return totals, counts
+
+
+def _brandes_source(g: Graph, source: int, load: Dict[int, float]) -> Tuple[int, int]:
+    """
+    One BFS from `source` with Brandes dependency accumulation.
+
+    Adds to load[v] the fraction of shortest paths from `source` that pass
+    through v, summed over all targets. Returns (sum of distances,
+    number of reachable targets), as _source_path_sums would.
+    """
+    dist = {source: 0}
+    sigma = {source: 1}
+    preds: Dict[int, List[int]] = {source: []}
+    order = []
+    queue = deque([source])
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        for w in g.neighbors(v):
+            if w not in dist:
+                dist[w] = dist[v] + 1
+                sigma[w] = 0
+                preds[w] = []
+                queue.append(w)
+            if dist[w] == dist[v] + 1:
+                sigma[w] += sigma[v]
+                preds[w].append(v)
+
+    delta = dict.fromkeys(order, 0.0)
+    for w in reversed(order):
+        coeff = (1 + delta[w]) / sigma[w]
+        for v in preds[w]:
+            delta[v] += sigma[v] * coeff
+        if w != source:
+            load[w] += delta[w]
+    return sum(dist.values()), len(dist) - 1
+
+
+def _csr_brandes(indptr, indices, source: int, load) -> Tuple[int, int]:
+    """
+    Level-synchronous BFS over CSR arrays with Brandes accumulation.
+
+    The forward pass keeps, per level, the shortest-path DAG edges into
+    the new frontier and sums path counts over them; the backward pass
+    walks the levels in reverse, pushing dependencies to the parents.
+    Both passes are vectorized per level. Path counts are float64, which
+    only loses precision beyond 2**53 equal-length paths.
+    """
+    n = len(indptr) - 1
+    dist = np.full(n, -1, dtype=np.int32)
+    sigma = np.zeros(n)
+    dist[source] = 0
+    sigma[source] = 1.0
+    frontier = np.array([source], dtype=np.int64)
+    levels = []
+    total = 0
+    count = 0
+    depth = 0
+    while frontier.size:
+        depth += 1
+        positions, lengths = _adjacency_positions(indptr, frontier)
+        targets = indices[positions]
+        parents = np.repeat(frontier, lengths)
+        fresh = _sorted_unique(targets[dist[targets] < 0])
+        if fresh.size == 0:
+            break
+        dist[fresh] = depth
+        on_dag = dist[targets] == depth
+        parents, targets = parents[on_dag], targets[on_dag]
+        slot = np.searchsorted(fresh, targets)
+        sigma[fresh] = np.bincount(slot, weights=sigma[parents], minlength=fresh.size)
+        levels.append((frontier, parents, targets))
+        total += depth * fresh.size
+        count += fresh.size
+        frontier = fresh
+
+    delta = np.zeros(n)
+    for level_nodes, parents, targets in reversed(levels):
+        share = sigma[parents] / sigma[targets] * (1 + delta[targets])
+        delta[level_nodes] = np.bincount(np.searchsorted(level_nodes, parents), weights=share,
+                                         minlength=level_nodes.size)
+    delta[source] = 0.0
+    load += delta
+    return total, count
+
+
+def _source_load_sums(g: Graph, sources) -> Tuple[List[int], List[int], object]:
+    """Per-source distance sums and reachable counts, plus the summed relay load."""
+    totals = []
+    counts = []
+    if isinstance(g, CompactGraph):
+        load = np.zeros(g.number_of_nodes())
+        for source in sources:
+            t, c = _csr_brandes(g.indptr, g.indices, int(source), load)
+            totals.append(t)
+            counts.append(c)
+    else:
+        load = dict.fromkeys(g.nodes(), 0.0)
+        for source in sources:
+            t, c = _brandes_source(g, source, load)
+            totals.append(t)
+            counts.append(c)
+    return totals, counts, load
+
+
+# Per-process view of the graph arrays, set up by _attach_shared_graph
+_WORKER_GRAPH: Optional[Tuple] = None
+
+
+def _attach_shared_graph(specs, engine: str = 'bfs'):
+    """Pool initializer: map the parent's shared CSR arrays without copying."""
+    global _WORKER_GRAPH
+    handles = []
+    arrays = []
+    for name, shape, dtype in specs:
+        shm = shared_memory.SharedMemory(name=name)
+        handles.append(shm)
+        arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+    # Keep the handles alive for as long as the arrays are in use
+    weights = arrays[2] if len(arrays) > 2 else None
+    _WORKER_GRAPH = (handles, CompactGraph(arrays[0], arrays[1], weights=weights), engine)
+
+
+def _shared_source_path_sums(sources) -> Tuple[List[int], List[int]]:
+    _, graph, engine = _WORKER_GRAPH
+    return _source_path_sums(graph, sources, engine)
+
+
+def _shared_source_load_sums(sources) -> Tuple[List[int], List[int], object]:
+    _, graph, _ = _WORKER_GRAPH
+    return _source_load_sums(graph, sources)
+
+
+def _share_arrays(*arrays):
+    """Copy arrays into new shared memory blocks; returns (handles, specs)."""
+    handles = []
+    specs = []
+    for arr in arrays:
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        handles.append(shm)
+        specs.append((shm.name, arr.shape, arr.dtype.str))
+    return handles, specs
+
+
+def _release_shared(handles):
+    for shm in handles:
+        shm.close()
+        shm.unlink()
+
+
+class BFSPool:
+    """
+    Runs batches of BFS sources, optionally across a process pool.
+
+    With workers > 1 the CSR arrays are placed in shared memory once and
+    mapped by each worker, so the graph is never pickled and the pool can
+    be reused for successive batches. The 'bitset' engine runs many
+    sources per pass and needs the graph in compact form; the 'weighted'
+    engine needs a weighted CompactGraph. Use as a context manager.
+    """
+
+    def __init__(self, g: Graph, workers: int = 1, engine: str = 'bfs'):
+        if engine not in PATH_ENGINES:
+            raise ValueError(f"Unknown path-length engine {engine!r}; expected one of {PATH_ENGINES}")
+        self.workers = max(1, workers)
+        self.engine = engine
+        # Sources are given as node ids of the graph passed in
+        self._frozen_here = (self.workers > 1 or engine == 'bitset') and not isinstance(g, CompactGraph)
+        if self._frozen_here:
+            g = g.freeze()
+        self.graph = g
+        self._handles = []
+        self._pool = None
+
+    @property
+    def frozen_graph(self) -> Optional[CompactGraph]:
+        """The CompactGraph frozen from a plain Graph for this pool, else None."""
+        return self.graph if self._frozen_here else None
+
+    def __enter__(self) -> 'BFSPool':
+        if self.workers > 1:
+            arrays = [self.graph.indptr, self.graph.indices]
+            if self.engine == 'weighted':
+                arrays.append(self.graph.weights)
+            self._handles, specs = _share_arrays(*arrays)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_attach_shared_graph,
+                                             initargs=(specs, self.engine))
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        _release_shared(self._handles)
+        self._handles = []
+
+    def source_sums(self, sources) -> Tuple[List[int], List[int]]:
+        """
+        Per-source (distance sum, reachable count) for `sources`.
+
+        Sources are dealt round-robin into chunks to balance work, so the
+        returned lists follow chunk order rather than input order.
+        """
+        sources = list(sources)
+        if self._frozen_here:
+            sources = self.graph.index_of(sources).tolist()
+        num_chunks = min(len(sources), self.workers * 4)
+        if self._pool is None or num_chunks <= 1:
+            return _source_path_sums(self.graph, sources, self.engine)
+
+        chunks = [sources[i::num_chunks] for i in range(num_chunks)]
+        totals = []
+        counts = []
+        for t, c in self._pool.map(_shared_source_path_sums, chunks):
+            totals.extend(t)
+            counts.extend(c)
+        return totals, counts
+
+    def load_sums(self, sources) -> Tuple[List[int], List[int], object]:
+        """
+        Like source_sums, plus each node's relay load summed over `sources`.
+
+        Hop-count BFS is used whatever the engine. The load is an array
+        indexed by node for a compact graph (including one frozen here),
+        or a dict keyed by node id for a plain Graph run serially.
+        """
+        sources = list(sources)
+        if self._frozen_here:
+            sources = self.graph.index_of(sources).tolist()
+        num_chunks = min(len(sources), self.workers * 4)
+        if self._pool is None or num_chunks <= 1:
+            return _source_load_sums(self.graph, sources)
+
+        chunks = [sources[i::num_chunks] for i in range(num_chunks)]
+        totals = []
+        counts = []
+        load = np.zeros(self.graph.number_of_nodes())
+        for t, c, partial in self._pool.map(_shared_source_load_sums, chunks):
+            totals.extend(t)
+            counts.extend(c)
+            load += partial
+        return totals, counts, load
+
+
+# Number of batches a progress-reporting all-pairs BFS is split into
+PROGRESS_BATCHES = 100
+
+
+def parallel_path_length_sums(g: Graph, sources, workers: int, engine: str = 'bfs',
+                              progress: Optional[Callable[[int], None]] = None) -> Tuple[int, int]:
+    """
+    Run BFS from `sources` across a process pool.
+
+    The integer partial sums are reduced in the parent, so the result is
+    identical to the serial computation. With a `progress` callback the
+    sources are processed in batches and progress(sources_done) is called
+    after each one.
+
+    Returns:
+        (sum of distances, number of reachable ordered pairs)
+    """
+    sources = list(sources)
+    batch = len(sources)
+    if progress is not None:
+        batch = max(len(sources) // PROGRESS_BATCHES, 64 * BITSET_WORDS * workers, 1)
+
+    total = 0
+    count = 0
+    with BFSPool(g, workers, engine) as pool:
+        for start in range(0, len(sources), batch):
+            totals, counts = pool.source_sums(sources[start:start + batch])
+            total += sum(totals)
+            count += sum(counts)
+            if progress is not None:
+                progress(len(totals))
+    return total, count
+
+
+def path_length_stats(g: Graph, workers: int = 1, engine: str = 'bfs',
+                      progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    All-pairs path length together with explicit reachability counts.
+
+    L averages over reachable ordered pairs only; on a disconnected graph
+    the unreachable pairs are reported rather than silently dropped.
+    """
+    n = g.number_of_nodes()
+    possible = n * (n - 1)
+    if n < 2:
+        return {'L': 0, 'reachable_pairs': 0, 'unreachable_pairs': 0,
+                'unreachable_fraction': 0.0}
+
+    total, count = parallel_path_length_sums(g, g.nodes(), workers, engine, progress)
+    return {
+        'L': total / count if count > 0 else float('inf'),
+        'reachable_pairs': count,
+        'unreachable_pairs': possible - count,
+        'unreachable_fraction': (possible - count) / possible,
+    }
+
+
+def _ratio_confidence(totals: List[int], counts: List[int], population: int,
+                      z: float) -> float:
+    """
+    Half-width of the confidence interval for sum(totals) / sum(counts).
+
+    Uses the delta-method variance of a ratio estimator under sampling
+    without replacement, including the finite population correction.
+    """
+    k = len(totals)
+    if k >= population:
+        return 0.0
+    if k < 2:
+        return float('inf')
+    ratio = sum(totals) / sum(counts)
+    mean_count = sum(counts) / k
+    s2 = sum((t - ratio * c) ** 2 for t, c in zip(totals, counts)) / (k - 1)
+    variance = (1 - k / population) * s2 / (k * mean_count ** 2)
+    return z * math.sqrt(variance)
+
+
+def _ratio_confidence_from_moments(k: int, moments: List[int], population: int,
+                                   z: float) -> float:
+    """
+    _ratio_confidence from running sums (Σt, Σc, Σt², Σc², Σtc) over k
+    samples. With integer sums the residual sum of squares is exact.
+    """
+    if k >= population:
+        return 0.0
+    if k < 2:
+        return float('inf')
+    st, sc, stt, scc, stc = moments
+    # Σ(t - ratio * c)² scaled by Σc² to stay in integers
+    residual = (sc * sc * stt - 2 * st * sc * stc + st * st * scc) / (sc * sc)
+    variance = (1 - k / population) * residual / (k - 1) / (k * (sc / k) ** 2)
+    return z * math.sqrt(max(variance, 0.0))
+
+
+def estimate_path_length(
+    g: Graph,
+    samples: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    precision: Optional[float] = None,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    engine: str = 'bfs',
+    progress: Optional[Callable[[int], None]] = None,
+) -> Dict:
+    """
+    Estimate average shortest path length from a random sample of pivots.
+
+    Pivot sources are drawn without replacement and processed in batches.
+    After each batch the estimate and its confidence interval are
+    refreshed; sampling stops once `samples` pivots are done, the relative
+    half-width drops to `precision`, or `time_budget` seconds have elapsed.
+    With no stopping rule every node is used and the result is exact.
+
+    Args:
+        g: Graph or CompactGraph
+        samples: Maximum number of pivot sources
+        time_budget: Wall-clock seconds to keep refining
+        precision: Target half-width relative to the estimate (e.g. 0.01)
+        confidence: Confidence level of the reported interval
+        seed: Seed for pivot selection
+        workers: Processes used for each batch of BFS
+        engine: 'bfs' (one source at a time), 'bitset' (multi-source) or
+            'weighted' (delta-stepping over the edge weights of a weighted
+            CompactGraph)
+        progress: Called with the number of pivots finished after each batch
+
+    Returns:
+        Dict with the estimate 'L', interval half-width 'ci', the number of
+        pivots used, the estimated fraction of unreachable pairs, and
+        whether the estimate is exact
+    """
+    nodes = g.nodes()
+    n = len(nodes)
+    if n < 2:
+        return {'L': 0, 'ci': 0.0, 'sources': n, 'confidence': confidence,
+                'unreachable_fraction': 0.0, 'exact': True}
+
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    limit = min(samples, n) if samples is not None else n
+
+    order = list(nodes)
+    random.Random(seed).shuffle(order)
+    batch = 64 * BITSET_WORDS * workers if engine == 'bitset' else max(16, 8 * workers)
+
+    totals = []
+    counts = []
+    L = float('inf')
+    ci = float('inf')
+    with BFSPool(g, workers, engine) as pool:
+        while len(totals) < limit:
+            t, c = pool.source_sums(order[len(totals):min(len(totals) + batch, limit)])
+            totals.extend(t)
+            counts.extend(c)
+            if progress is not None:
+                progress(len(t))
+
+            if sum(counts) > 0:
+                L = sum(totals) / sum(counts)
+                ci = _ratio_confidence(totals, counts, n, z)
+            if precision is not None and ci <= precision * L:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+    return {
+        'L': L,
+        'ci': ci if sum(counts) > 0 else float('inf'),
+        'sources': len(totals),
+        'confidence': confidence,
+        'unreachable_fraction': 1 - sum(counts) / (len(totals) * (n - 1)),
+        'exact': len(totals) == n,
+    }
+
+
+def average_path_length(g: Graph, workers: int = 1, samples: Optional[int] = None,
+                        seed: Optional[int] = None, engine: str = 'bfs',
+                        progress: Optional[Callable[[int], None]] = None) -> float:
+    """
+    Calculate average shortest path length.
+
+    Args:
+        g: Graph or CompactGraph
+        workers: Number of processes for the all-pairs BFS; values above 1
+            freeze a plain Graph into compact form and share it with the pool
+        samples: If given, estimate from this many random pivot sources
+            (see estimate_path_length for error bars)
+        seed: Seed for pivot selection
+        engine: 'bfs' (one source at a time), 'bitset' (64 * BITSET_WORDS
+            sources per pass over the compact graph) or 'weighted'
+            (shortest weighted distances; needs a weighted CompactGraph)
+        progress: Called with the number of BFS sources finished
+
+    Unreachable pairs are excluded from the average; use path_length_stats
+    to see how many there are, or relay_load for per-node betweenness from
+    the same BFS pass.
+    """
+    if samples is not None:
+        return estimate_path_length(g, samples=samples, seed=seed, workers=workers,
+                                    engine=engine, progress=progress)['L']
+
     nodes = g.nodes()
     n = len(nodes)
     if n < 2:
@@ -148,6 +1288,10 @@ def average_path_length(g: Graph) -> float:
     
     total = 0
     count = 0
+
+    if workers > 1 or engine != 'bfs' or isinstance(g, CompactGraph):
+        total, count = parallel_path_length_sums(g, nodes, workers, engine, progress)
+        return total / count if count > 0 else float('inf')
     
     for source in nodes:
         dists = shortest_path_lengths(g, source)
@@ -155,58 +1299,553 @@ def average_path_length(g: Graph) -> float:
             if target != source:
                 total += d
                 count += 1
+        if progress is not None:
+            progress(1)
     
     return total / count if count > 0 else float('inf')
 
 
-def clustering_coefficient(g: Graph) -> float:
-    """Calculate average clustering coefficient."""
+def relay_load(g: Graph, samples: Optional[int] = None, seed: Optional[int] = None,
+               workers: int = 1, confidence: float = 0.95,
+               progress: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    Per-node relay load (betweenness) and path length from one BFS pass.
+
+    Each BFS source also runs Brandes' dependency accumulation, so the
+    relay load costs one backward sweep per source on top of the BFS that
+    average_path_length does anyway. load[v] counts the ordered pairs
+    (s, t) whose shortest paths pass through v, split evenly when there
+    are several; it sums to the number of intermediate hops over all
+    pairs, reachable_pairs * (L - 1).
+
+    With `samples`, pivots are drawn as in estimate_path_length (the same
+    seed gives the same pivots and the same L) and the load and pair
+    counts are scaled by n / samples, an unbiased estimate.
+
+    Args:
+        g: Graph or CompactGraph (edge weights are ignored; hops count)
+        samples: Number of pivot sources; None runs every node
+        seed: Seed for pivot selection
+        workers: Processes for the BFS; values above 1 freeze a plain
+            Graph into compact form and share it with the pool
+        confidence: Confidence level of the reported L interval
+        progress: Called with the number of sources finished after each batch
+
+    Returns:
+        Dict with 'L', its interval half-width 'ci', 'load' (an array
+        indexed by node for a CompactGraph, otherwise a dict keyed by node
+        id), 'reachable_pairs', 'unreachable_fraction', the number of
+        pivot 'sources', and whether the result is 'exact'
+    """
+    nodes = g.nodes()
+    n = len(nodes)
+    compact = isinstance(g, CompactGraph)
+    if n < 2:
+        return {'L': 0, 'ci': 0.0, 'load': np.zeros(n) if compact else dict.fromkeys(nodes, 0.0),
+                'reachable_pairs': 0, 'unreachable_fraction': 0.0, 'sources': n, 'exact': True}
+
+    order = list(nodes)
+    if samples is not None and samples < n:
+        random.Random(seed).shuffle(order)
+        order = order[:samples]
+    batch = len(order) if progress is None else max(16, 8 * workers)
+
+    totals = []
+    counts = []
+    load = None
+    with BFSPool(g, workers) as pool:
+        for start in range(0, len(order), batch):
+            t, c, partial = pool.load_sums(order[start:start + batch])
+            totals.extend(t)
+            counts.extend(c)
+            if load is None:
+                load = partial
+            elif isinstance(load, dict):
+                for v, x in partial.items():
+                    load[v] += x
+            else:
+                load += partial
+            if progress is not None:
+                progress(len(t))
+        frozen = pool.frozen_graph
+
+    scale = n / len(order)
+    if frozen is not None:
+        # Report the load of a Graph frozen for the pool by original node id
+        ids = frozen.labels.tolist() if frozen.labels is not None else range(n)
+        load = dict(zip(ids, (load * scale).tolist()))
+    elif isinstance(load, dict):
+        load = {v: x * scale for v, x in load.items()}
+    else:
+        load *= scale
+
+    reached = sum(counts)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    return {
+        'L': sum(totals) / reached if reached > 0 else float('inf'),
+        'ci': _ratio_confidence(totals, counts, n, z) if reached > 0 else float('inf'),
+        'load': load,
+        'reachable_pairs': reached * scale,
+        'unreachable_fraction': 1 - reached / (len(order) * (n - 1)),
+        'sources': len(order),
+        'exact': len(order) == n,
+    }
+
+
+# Oriented edges processed per vectorized triangle-counting chunk
+TRIANGLE_CHUNK = 1 << 20
+
+
+def _forward_triangles(g: Graph) -> Tuple[Dict[int, int], Dict[int, int], set]:
+    """
+    Per-node triangle counts with the degree-ordered forward algorithm.
+
+    Each edge is oriented from lower to higher (degree, id) rank, so every
+    triangle is found exactly once as the intersection of two forward
+    neighbor sets, in O(m^1.5) set work instead of O(sum k^2) lookups.
+    Self-loops are left out of the triangle search but, as in
+    Graph.degree, still count towards the degree.
+
+    Returns:
+        (triangles per node, degree per node, nodes with a self-loop),
+        keyed by node id
+    """
+    nodes = g.nodes()
+    degree = {}
+    adjacency = {}
+    loops = set()
+    for v in nodes:
+        nbrs = g.neighbors(v)
+        nbrs = set(nbrs.tolist()) if isinstance(g, CompactGraph) else set(nbrs)
+        degree[v] = len(nbrs)
+        if v in nbrs:
+            nbrs.discard(v)
+            loops.add(v)
+        adjacency[v] = nbrs
+
+    rank = {v: r for r, v in enumerate(sorted(nodes, key=lambda v: (degree[v], v)))}
+    forward = {v: {u for u in adjacency[v] if rank[u] > rank[v]} for v in nodes}
+
+    triangles = dict.fromkeys(nodes, 0)
+    for v in nodes:
+        fv = forward[v]
+        for u in fv:
+            for w in fv & forward[u]:
+                triangles[v] += 1
+                triangles[u] += 1
+                triangles[w] += 1
+    return triangles, degree, loops
+
+
+def _loop_pairs(k: int, looped: bool) -> int:
+    """
+    Neighbor pairs closed by a node's own self-loop: the loop makes v its
+    own neighbor, adjacent to each of its k - 1 other neighbors, as the
+    pairwise definition of local clustering counts it.
+    """
+    return k - 1 if looped else 0
+
+
+def _csr_triangles(g: 'CompactGraph'):
+    """
+    Vectorized forward triangle counting over CSR arrays.
+
+    Edges are oriented by (degree, index) rank; for each oriented edge
+    (a, b) the forward neighbors w of b are looked up among the forward
+    edges of a with one searchsorted over the sorted edge keys. Work is
+    chunked so memory stays bounded by TRIANGLE_CHUNK edges of wedges.
+
+    Returns:
+        Array of triangle counts per node index
+    """
+    n = g.number_of_nodes()
+    deg = g.degrees()
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), deg))] = np.arange(n)
+
+    src = np.repeat(np.arange(n, dtype=np.int64), deg)
+    dst = g.indices.astype(np.int64)
+    forward = rank[src] < rank[dst]
+    src, dst = src[forward], dst[forward]
+    # CSR order keeps (src, dst) sorted, so the forward keys are sorted too
+    keys = src * n + dst
+    fwd_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=fwd_indptr[1:])
+
+    triangles = np.zeros(n, dtype=np.int64)
+    for start in range(0, len(src), TRIANGLE_CHUNK):
+        a = src[start:start + TRIANGLE_CHUNK]
+        b = dst[start:start + TRIANGLE_CHUNK]
+        lengths = fwd_indptr[b + 1] - fwd_indptr[b]
+        w = _gather_neighbors(fwd_indptr, dst, b)
+        a = np.repeat(a, lengths)
+        b = np.repeat(b, lengths)
+        probe = a * n + w
+        pos = np.minimum(np.searchsorted(keys, probe), max(len(keys) - 1, 0))
+        closed = keys[pos] == probe
+        for ends in (a, b, w):
+            triangles += np.bincount(ends[closed], minlength=n)
+    return triangles
+
+
+def clustering_stats(g: Graph, vectorized: Optional[bool] = None) -> Dict:
+    """
+    Local clustering, average clustering and transitivity in one pass.
+
+    Args:
+        g: Graph or CompactGraph
+        vectorized: Use the NumPy triangle counter; defaults to True for a
+            CompactGraph. A plain Graph is frozen first when set.
+
+    Returns:
+        Dict with 'average_clustering' (mean local clustering over all
+        nodes, counting k < 2 as 0), 'transitivity' (3 × triangles /
+        connected triples), 'triangles', and 'local' per-node clustering:
+        a dict keyed by node id for the set-based path, or an array indexed
+        by node for the vectorized path
+    """
+    if vectorized is None:
+        vectorized = isinstance(g, CompactGraph)
+
+    if vectorized:
+        if not isinstance(g, CompactGraph):
+            g = g.freeze()
+        n = g.number_of_nodes()
+        if n == 0:
+            return {'average_clustering': 0, 'transitivity': 0, 'triangles': 0,
+                    'local': np.zeros(0)}
+        per_node = _csr_triangles(g)
+        deg = g.degrees().astype(np.float64)
+        triples = deg * (deg - 1) / 2
+        local = np.divide(per_node, triples, out=np.zeros(n), where=triples > 0)
+        total_triangles = int(per_node.sum()) // 3
+        total_triples = float(triples.sum())
+        return {
+            'average_clustering': float(local.sum()) / n,
+            'transitivity': 3 * total_triangles / total_triples if total_triples else 0,
+            'triangles': total_triangles,
+            'local': local,
+        }
+
     nodes = g.nodes()
     if not nodes:
-        return 0
-    
+        return {'average_clustering': 0, 'transitivity': 0, 'triangles': 0, 'local': {}}
+
+    per_node, degree, loops = _forward_triangles(g)
+    local = {}
     total = 0
+    total_triples = 0
     for v in nodes:
-        neighbors = list(g.neighbors(v))
-        k = len(neighbors)
+        k = degree[v]
         if k < 2:
+            local[v] = 0.0
             continue
-        
-        # Count edges between neighbors
-        edges_between = 0
-        for i in range(len(neighbors)):
-            for j in range(i + 1, len(neighbors)):
-                if neighbors[j] in g.neighbors(neighbors[i]):
-                    edges_between += 1
-        
-        # Maximum possible edges
         max_edges = k * (k - 1) / 2
-        total += edges_between / max_edges
-    
-    return total / len(nodes)
+        local[v] = (per_node[v] + _loop_pairs(k, v in loops)) / max_edges
+        total += local[v]
+        total_triples += max_edges
+    total_triangles = sum(per_node.values()) // 3
+
+    return {
+        'average_clustering': total / len(nodes),
+        'transitivity': 3 * total_triangles / total_triples if total_triples else 0,
+        'triangles': total_triangles,
+        'local': local,
+    }
+
+
+def clustering_coefficient(g: Graph) -> float:
+    """Calculate average clustering coefficient."""
+    return clustering_stats(g)['average_clustering']
+
+
+# Seed of the first random baseline; ensembles use consecutive seeds
+BASELINE_SEED = 42
+
+
+class BaselineCache:
+    """
+    On-disk memo of random-graph baseline metrics.
 
+    Each entry is a small JSON file named by a hash of its key (n, m,
+    seed, estimator mode). Reads refresh the file's mtime, and writes
+    evict the least recently used entries beyond max_entries.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: Dict) -> str:
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest[:32]}.json")
+
+    def get(self, key: Dict) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('key') != key:
+            return None
+        os.utime(path)
+        return entry['value']
+
+    def put(self, key: Dict, value: Dict):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'key': key, 'value': value}, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_entries, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _estimator_mode(approximate: bool, samples: Optional[int], precision: Optional[float],
+                    pivot_seed: Optional[int]) -> str:
+    # The time budget is left out: it changes every run, and estimates it
+    # cut short are not cached (see _reached_stopping_rule)
+    if not approximate:
+        return 'exact'
+    return f"approx:samples={samples},precision={precision},pivot_seed={pivot_seed}"
 
-def small_world_metrics(g: Graph) -> Dict:
-    """Calculate comprehensive small-world metrics."""
-    n = len(g.nodes())
-    m = len(g.edges())
+
+def _reached_stopping_rule(result: Dict, n: int, samples: Optional[int],
+                           precision: Optional[float]) -> bool:
+    """Whether every estimate in a baseline stopped on samples or precision, not time."""
+    for name in ('L_random', 'L_weighted_random'):
+        if f'{name}_sources' not in result:
+            continue
+        done = result[f'{name}_sources'] >= min(samples if samples is not None else n, n)
+        precise = precision is not None and result[f'{name}_ci'] <= precision * result[name]
+        if not (done or precise):
+            return False
+    return True
+
+
+def random_baseline(n: int, m: int, seed: int = BASELINE_SEED, compact: bool = False,
+                    approximate: bool = False, samples: Optional[int] = None,
+                    precision: Optional[float] = None, time_budget: Optional[float] = None,
+                    pivot_seed: Optional[int] = None, engine: str = 'bfs',
+                    workers: int = 1, profiler: Optional[PhaseProfiler] = None,
+                    edge_weights=None) -> Dict:
+    """
+    C and L of one Erdős-Rényi G(n, m) draw, the reference for γ and λ.
+
+    Args:
+        edge_weights: Weights of the graph under study; when given, a
+            seeded permutation of them is assigned to the random edges and
+            the weighted path length is measured as well
+
+    Returns:
+        Dict with 'C_random' and 'L_random'; in approximate mode also the
+        interval half-width 'L_random_ci' and pivots used. With
+        edge_weights, the same for 'L_weighted_random'.
+    """
+    weighted = edge_weights is not None
+    with phase(profiler, 'random_baseline', total=m, unit='edges'):
+        g_random = erdos_renyi(n, m, seed=seed, compact=compact or weighted)
+        if weighted:
+            shuffled = np.random.default_rng(seed).permutation(np.asarray(edge_weights))
+            g_random = g_random.with_edge_weights(shuffled)
+    with phase(profiler, 'C_random', total=n, unit='nodes'):
+        result = {'seed': seed, 'C_random': clustering_coefficient(g_random)}
+    sources = min(samples, n) if approximate and samples is not None else n
+    if approximate and weighted and time_budget is not None:
+        time_budget /= 2
+
+    measures = [('L_random', engine)]
+    if weighted:
+        measures.append(('L_weighted_random', 'weighted'))
+    for name, path_engine in measures:
+        with phase(profiler, name, total=sources, unit='sources') as p:
+            if approximate:
+                estimate = estimate_path_length(g_random, samples=samples, time_budget=time_budget,
+                                                precision=precision, seed=pivot_seed,
+                                                workers=workers, engine=path_engine,
+                                                progress=p.advance)
+                result[name] = estimate['L']
+                result[f'{name}_ci'] = estimate['ci']
+                result[f'{name}_sources'] = estimate['sources']
+            else:
+                result[name] = average_path_length(g_random, workers=workers, engine=path_engine,
+                                                   progress=p.advance)
+    return result
+
+
+def _random_baseline_job(kwargs: Dict) -> Dict:
+    return random_baseline(**kwargs)
+
+
+def random_baseline_ensemble(n: int, m: int, draws: int = 1, seed: int = BASELINE_SEED,
+                             workers: int = 1, cache: Optional[BaselineCache] = None,
+                             time_budget: Optional[float] = None,
+                             profiler: Optional[PhaseProfiler] = None, **options) -> List[Dict]:
+    """
+    Baseline metrics for `draws` random graphs with seeds seed, seed+1, ...
+
+    Draws found in `cache` are reused. With several missing draws and
+    workers > 1, the draws run in parallel, one per process; a single
+    draw instead uses the workers for its own path-length BFS.
+
+    Args:
+        time_budget: Seconds for all missing draws together; estimates it
+            cuts short are returned but not cached
+        options: Passed to random_baseline (compact, approximate, samples,
+            precision, pivot_seed, engine, edge_weights)
+
+    Returns:
+        One random_baseline result per draw, in seed order
+    """
+    seeds = [seed + i for i in range(draws)]
+    mode = _estimator_mode(options.get('approximate', False), options.get('samples'),
+                           options.get('precision'), options.get('pivot_seed'))
+    if options.get('edge_weights') is not None:
+        weights = np.ascontiguousarray(options['edge_weights'], dtype=np.float64)
+        mode += f",weights={hashlib.sha256(weights.tobytes()).hexdigest()[:16]}"
+    keys = [{'n': n, 'm': m, 'seed': s, 'mode': mode} for s in seeds]
+
+    results = {}
+    if cache is not None:
+        for s, key in zip(seeds, keys):
+            hit = cache.get(key)
+            if hit is not None:
+                results[s] = hit
+
+    missing = [s for s in seeds if s not in results]
+    parallel = workers > 1 and len(missing) > 1
+    rounds = math.ceil(len(missing) / workers) if parallel else len(missing)
+    budget = time_budget / rounds if time_budget is not None and rounds else None
+    jobs = [dict(options, n=n, m=m, seed=s, time_budget=budget,
+                 workers=1 if parallel else workers) for s in missing]
+    if parallel:
+        with phase(profiler, 'random_baseline', total=len(jobs), unit='graphs') as p:
+            with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+                computed = []
+                for result in pool.map(_random_baseline_job, jobs):
+                    computed.append(result)
+                    p.advance()
+    else:
+        computed = [random_baseline(profiler=profiler, **job) for job in jobs]
+
+    for s, result in zip(missing, computed):
+        results[s] = result
+        if cache is not None and _reached_stopping_rule(result, n, options.get('samples'),
+                                                        options.get('precision')):
+            cache.put(keys[seeds.index(s)], result)
+
+    return [results[s] for s in seeds]
+
+
+def small_world_metrics(g: Graph, workers: int = 1, approximate: bool = False,
+                        samples: Optional[int] = None,
+                        time_budget: Optional[float] = None,
+                        precision: Optional[float] = None,
+                        seed: Optional[int] = None, engine: str = 'bfs',
+                        baseline_draws: int = 1,
+                        cache: Optional[BaselineCache] = None,
+                        profiler: Optional[PhaseProfiler] = None,
+                        weighted: Optional[bool] = None) -> Dict:
+    """
+    Calculate comprehensive small-world metrics.
+
+    Args:
+        g: Graph or CompactGraph
+        workers: Processes used for the path-length BFS of g and its baseline
+        approximate: Estimate L and L_random from sampled pivot sources and
+            report confidence intervals instead of running all-pairs BFS
+        samples, precision: Stopping rules for the estimator, applied to
+            each of L and L_random
+        time_budget: Seconds shared between the two estimates
+        seed: Seed for pivot selection
+        engine: Hop-count engine, 'bfs' or 'bitset'; weighted L always
+            uses the 'weighted' engine
+        baseline_draws: Number of random graphs in the baseline ensemble;
+            with more than one, γ, λ and σ are averaged over the draws and
+            their standard deviations are reported
+        cache: Optional on-disk store of baseline results
+        profiler: Records the C, L, random_baseline, C_random and L_random
+            phases, with progress for the path-length BFS
+        weighted: Also report the weighted (e.g. latency) path length
+            L_weighted and σ_weighted, using edge weights as lengths and
+            a random baseline carrying the same weights shuffled over its
+            edges. Defaults to whether g is a weighted CompactGraph.
+    """
+    n = g.number_of_nodes()
+    m = g.number_of_edges()
     k = 2 * m / n if n > 0 else 0
+    if weighted is None:
+        weighted = isinstance(g, CompactGraph) and g.weighted
+    if weighted and not (isinstance(g, CompactGraph) and g.weighted):
+        raise ValueError("Weighted metrics need a CompactGraph with edge weights")
     
-    C = clustering_coefficient(g)
-    L = average_path_length(g)
+    with phase(profiler, 'C', total=n, unit='nodes'):
+        clustering = clustering_stats(g)
+    C = clustering['average_clustering']
+    sources = min(samples, n) if approximate and samples is not None else n
+    started = time.monotonic()
+    budget = None
+    if approximate and time_budget is not None:
+        budget = time_budget / (4 if weighted else 2)
+
+    measures = [('L', engine)]
+    if weighted:
+        measures.append(('L_weighted', 'weighted'))
+    estimates = {}
+    for name, path_engine in measures:
+        with phase(profiler, name, total=sources, unit='sources') as p:
+            if approximate:
+                estimates[name] = estimate_path_length(g, samples=samples, time_budget=budget,
+                                                       precision=precision, seed=seed,
+                                                       workers=workers, engine=path_engine,
+                                                       progress=p.advance)
+            else:
+                estimates[name] = path_length_stats(g, workers=workers, engine=path_engine,
+                                                    progress=p.advance)
+    L_estimate = estimates['L']
+    L = L_estimate['L']
+    unreachable_fraction = L_estimate['unreachable_fraction']
     
-    # Create equivalent random graph for comparison
-    g_random = erdos_renyi(n, m, seed=42)
-    C_random = clustering_coefficient(g_random)
-    L_random = average_path_length(g_random)
+    # Create equivalent random graphs for comparison
+    budget = None
+    if approximate and time_budget is not None:
+        budget = max(time_budget - (time.monotonic() - started), 0.0)
+    baselines = random_baseline_ensemble(
+        n, m, draws=baseline_draws, workers=workers, cache=cache, time_budget=budget,
+        profiler=profiler, compact=isinstance(g, CompactGraph), approximate=approximate, samples=samples,
+        precision=precision, pivot_seed=seed, engine=engine,
+        edge_weights=g.edge_weights() if weighted else None)
+    C_random = mean(b['C_random'] for b in baselines)
+    L_random = mean(b['L_random'] for b in baselines)
     
-    # Small-world coefficient
-    if C_random > 0 and L_random > 0:
-        gamma = C / C_random
-        lambda_ = L / L_random
-        sigma = gamma / lambda_ if lambda_ > 0 else 0
-    else:
-        gamma = lambda_ = sigma = 0
+    # Small-world coefficient, per draw so an ensemble yields a spread
+    draws = []
+    for b in baselines:
+        if b['C_random'] > 0 and b['L_random'] > 0:
+            gamma = C / b['C_random']
+            lambda_ = L / b['L_random']
+            sigma = gamma / lambda_ if lambda_ > 0 else 0
+        else:
+            gamma = lambda_ = sigma = 0
+        draws.append((gamma, lambda_, sigma))
+    gamma, lambda_, sigma = (mean(values) for values in zip(*draws))
     
     # Expected small-world path length
     if k > 1:
@@ -214,11 +1853,12 @@ def small_world_metrics(g: Graph) -> Dict:
     else:
         L_expected_sw = n
     
-    return {
+    metrics = {
         'N': n,
         'M': m,
         'k': k,
         'C': C,
+        'transitivity': clustering['transitivity'],
         'L': L,
         'C_random': C_random,
         'L_random': L_random,
@@ -228,11 +1868,42 @@ def small_world_metrics(g: Graph) -> Dict:
         'is_small_world': sigma > 1,
         'L_expected_sw': L_expected_sw,
         'L_ratio': L / L_expected_sw if L_expected_sw > 0 else 0,
-        'interpretation': interpret_metrics(C, L, sigma, L_expected_sw)
+        'unreachable_fraction': unreachable_fraction,
+        'interpretation': interpret_metrics(C, L, sigma, L_expected_sw, unreachable_fraction)
     }
+    if len(baselines) > 1:
+        metrics['baseline_draws'] = len(baselines)
+        metrics['C_random_std'] = stdev(b['C_random'] for b in baselines)
+        metrics['L_random_std'] = stdev(b['L_random'] for b in baselines)
+        metrics['sigma_std'] = stdev(d[2] for d in draws)
+    if approximate:
+        metrics['L_ci'] = L_estimate['ci']
+        # Independent draws: the mean's half-width combines in quadrature
+        metrics['L_random_ci'] = math.sqrt(sum(b['L_random_ci'] ** 2 for b in baselines)) / len(baselines)
+        metrics['L_sources'] = L_estimate['sources']
+        metrics['L_random_sources'] = sum(b['L_random_sources'] for b in baselines)
+        metrics['confidence'] = L_estimate['confidence']
+    if weighted:
+        L_weighted = estimates['L_weighted']['L']
+        metrics['L_weighted'] = L_weighted
+        metrics['L_weighted_random'] = mean(b['L_weighted_random'] for b in baselines)
+        weighted_draws = []
+        for b, (gamma_b, _, _) in zip(baselines, draws):
+            lambda_w = L_weighted / b['L_weighted_random'] if b['L_weighted_random'] > 0 else 0
+            weighted_draws.append((lambda_w, gamma_b / lambda_w if lambda_w > 0 else 0))
+        metrics['lambda_weighted'] = mean(d[0] for d in weighted_draws)
+        metrics['sigma_weighted'] = mean(d[1] for d in weighted_draws)
+        if len(baselines) > 1:
+            metrics['sigma_weighted_std'] = stdev(d[1] for d in weighted_draws)
+        if approximate:
+            metrics['L_weighted_ci'] = estimates['L_weighted']['ci']
+            metrics['L_weighted_random_ci'] = (
+                math.sqrt(sum(b['L_weighted_random_ci'] ** 2 for b in baselines)) / len(baselines))
+    return metrics
 
 
-def interpret_metrics(C: float, L: float, sigma: float, L_expected: float) -> str:
+def interpret_metrics(C: float, L: float, sigma: float, L_expected: float,
+                      unreachable_fraction: float = 0.0) -> str:
     """Provide interpretation of small-world metrics."""
     parts = []
     
@@ -253,39 +1924,679 @@ def interpret_metrics(C: float, L: float, sigma: float, L_expected: float) -> st
         parts.append(f"✓ Logarithmic scaling (L ≈ {L_ratio:.1f} × log(N)/log(k))")
     else:
         parts.append(f"✗ Non-logarithmic scaling (L = {L_ratio:.1f} × log(N)/log(k))")
+
+    if unreachable_fraction > 0:
+        parts.append(f"✗ Disconnected ({unreachable_fraction:.1%} of node pairs unreachable; "
+                     f"L averages reachable pairs only)")
     
     return "; ".join(parts)
 
 
+class DynamicSmallWorld:
+    """
+    Small-world metrics kept current while edges are added and removed.
+
+    Triangle counts, local clustering and transitivity are updated in
+    O(k) per edge change from the common neighbors of the endpoints.
+    Path length is tracked from a fixed sample of pivot sources: each
+    pivot keeps its BFS distances, an insertion relaxes only the nodes
+    whose distance drops, and a deletion recomputes a pivot's BFS only
+    when the removed edge was the last shortest-path link to a node.
+    Running sums over the pivots, including the moments behind the
+    confidence interval, are updated with each change, and the random
+    baseline uses the Erdős-Rényi approximations C_random ≈ k/N and
+    L_random ≈ ln N / ln k, so metrics() is O(1).
+
+    The wrapped Graph is modified in place; change it only through this
+    object. Running sums of local clustering can drift by float rounding
+    over very long runs; recompute() resynchronizes everything.
+    """
+
+    def __init__(self, g: Graph, pivots: int = 32, seed: Optional[int] = None,
+                 confidence: float = 0.95):
+        self.graph = g
+        self._z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.confidence = confidence
+        nodes = g.nodes()
+        self.pivots = random.Random(seed).sample(nodes, min(pivots, len(nodes)))
+        self.recompute()
+
+    @staticmethod
+    def _pairs(k: int) -> int:
+        return k * (k - 1) // 2
+
+    def _local(self, v: int) -> float:
+        nbrs = self.graph.adj[v]
+        k = len(nbrs)
+        if k < 2:
+            return 0.0
+        return (self._triangles_at[v] + _loop_pairs(k, v in nbrs)) / self._pairs(k)
+
+    def recompute(self):
+        """Rebuild all counters from the current graph."""
+        g = self.graph
+        per_node, degree, _ = _forward_triangles(g)
+        self._triangles_at = per_node
+        self._triangles = sum(per_node.values()) // 3
+        self._triples = sum(self._pairs(k) for k in degree.values())
+        self._edges = g.number_of_edges()
+        self._local_sum = sum(self._local(v) for v in g.adj)
+
+        self._dist = []
+        self._totals = []
+        self._counts = []
+        self._moments = [0, 0, 0, 0, 0]
+        for i, pivot in enumerate(self.pivots):
+            dist = shortest_path_lengths(g, pivot)
+            self._dist.append(dist)
+            self._totals.append(0)
+            self._counts.append(0)
+            self._set_pivot(i, sum(dist.values()), len(dist) - 1)
+
+    def _set_pivot(self, i: int, total: int, count: int):
+        """Replace pivot i's distance sum and reach, keeping the running moments."""
+        t, c = self._totals[i], self._counts[i]
+        for j, (old, new) in enumerate(zip((t, c, t * t, c * c, t * c),
+                                           (total, count, total * total, count * count,
+                                            total * count))):
+            self._moments[j] += new - old
+        self._totals[i] = total
+        self._counts[i] = count
+
+    def add_node(self, v: int):
+        if v not in self.graph.adj:
+            self.graph.add_node(v)
+            self._triangles_at[v] = 0
+
+    def _change_edge(self, u: int, v: int, sign: int):
+        adj = self.graph.adj
+        if u == v:
+            # Dropping a self-loop only changes u's degree (add_edge refuses loops)
+            self._local_sum -= self._local(u)
+            self._triples -= self._pairs(len(adj[u]))
+            self.graph.remove_edge(u, u)
+            self._triples += self._pairs(len(adj[u]))
+            self._edges -= 1
+            self._local_sum += self._local(u)
+            return
+        # A self-loop at u or v must not make it a common neighbor
+        common = (adj[u] & adj[v]) - {u, v}
+        affected = common | {u, v}
+        self._local_sum -= sum(self._local(x) for x in affected)
+        self._triples -= self._pairs(len(adj[u])) + self._pairs(len(adj[v]))
+
+        if sign > 0:
+            self.graph.add_edge(u, v)
+        else:
+            self.graph.remove_edge(u, v)
+
+        self._triples += self._pairs(len(adj[u])) + self._pairs(len(adj[v]))
+        t = len(common)
+        self._triangles_at[u] += sign * t
+        self._triangles_at[v] += sign * t
+        for w in common:
+            self._triangles_at[w] += sign
+        self._triangles += sign * t
+        self._edges += sign
+        self._local_sum += sum(self._local(x) for x in affected)
+
+    def add_edge(self, u: int, v: int) -> bool:
+        """Insert edge (u, v); returns False if it was already present."""
+        if u == v or self.graph.has_edge(u, v):
+            return False
+        self.add_node(u)
+        self.add_node(v)
+        self._change_edge(u, v, +1)
+        for i in range(len(self.pivots)):
+            self._relax_pivot(i, u, v)
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        """Delete edge (u, v); returns False if it was not present."""
+        if not self.graph.has_edge(u, v):
+            return False
+        self._change_edge(u, v, -1)
+        for i in range(len(self.pivots)):
+            self._repair_pivot(i, u, v)
+        return True
+
+    def _relax_pivot(self, i: int, u: int, v: int):
+        """Propagate distance decreases from a new edge through pivot i's tree."""
+        dist = self._dist[i]
+        du, dv = dist.get(u), dist.get(v)
+        if du is None and dv is None:
+            return
+        if dv is None or (du is not None and du + 1 < dv):
+            start = v
+            dist_start = du + 1
+        elif du is None or dv + 1 < du:
+            start = u
+            dist_start = dv + 1
+        else:
+            return
+
+        adj = self.graph.adj
+        total, count = self._totals[i], self._counts[i]
+        queue = deque([(start, dist_start)])
+        while queue:
+            x, d = queue.popleft()
+            old = dist.get(x)
+            if old is not None and old <= d:
+                continue
+            dist[x] = d
+            if old is None:
+                count += 1
+                total += d
+            else:
+                total += d - old
+            for y in adj[x]:
+                dy = dist.get(y)
+                if dy is None or dy > d + 1:
+                    queue.append((y, d + 1))
+        self._set_pivot(i, total, count)
+
+    def _repair_pivot(self, i: int, u: int, v: int):
+        """Recompute pivot i's BFS only if (u, v) carried a shortest path."""
+        dist = self._dist[i]
+        du, dv = dist.get(u), dist.get(v)
+        if du is None or dv is None or abs(du - dv) != 1:
+            return
+        far, d_far = (v, dv) if dv > du else (u, du)
+        if any(dist.get(y) == d_far - 1 for y in self.graph.adj[far]):
+            return
+        dist = shortest_path_lengths(self.graph, self.pivots[i])
+        self._dist[i] = dist
+        self._set_pivot(i, sum(dist.values()), len(dist) - 1)
+
+    def metrics(self) -> Dict:
+        """Current C, transitivity, L (with CI) and σ, in O(1)."""
+        n = len(self.graph.adj)
+        m = self._edges
+        k = 2 * m / n if n > 0 else 0
+        C = self._local_sum / n if n else 0
+        pairs = self._moments[1]
+        L = self._moments[0] / pairs if pairs else float('inf')
+        L_ci = (_ratio_confidence_from_moments(len(self.pivots), self._moments, n, self._z)
+                if pairs else float('inf'))
+
+        C_random = k / n if n else 0
+        L_random = math.log(n) / math.log(k) if n > 1 and k > 1 else 0
+        if C_random > 0 and L_random > 0 and L > 0:
+            sigma = (C / C_random) / (L / L_random)
+        else:
+            sigma = 0
+        return {
+            'N': n,
+            'M': m,
+            'k': k,
+            'C': C,
+            'transitivity': 3 * self._triangles / self._triples if self._triples else 0,
+            'triangles': self._triangles,
+            'L': L,
+            'L_ci': L_ci,
+            'confidence': self.confidence,
+            'C_random': C_random,
+            'L_random': L_random,
+            'sigma': sigma,
+            'is_small_world': sigma > 1,
+        }
+
+
+# Columns of a Watts-Strogatz sweep record, in CSV order
+SWEEP_FIELDS = ('p', 'seed', 'C', 'L', 'C_over_C0', 'L_over_L0',
+                'gamma', 'lambda', 'sigma', 'seconds')
+
+
+def log_spaced(lo: float, hi: float, points: int) -> List[float]:
+    """`points` values from lo to hi, evenly spaced on a log scale."""
+    if points == 1:
+        return [lo]
+    ratio = hi / lo
+    return [lo * ratio ** (i / (points - 1)) for i in range(points)]
+
+
+def _clustering_and_path_length(g: Graph, approximate: bool = False,
+                                samples: Optional[int] = None,
+                                precision: Optional[float] = None,
+                                seed: Optional[int] = None, engine: str = 'bfs') -> Tuple[float, float]:
+    if np is not None and not isinstance(g, CompactGraph):
+        g = g.freeze()
+    C = clustering_coefficient(g)
+    if approximate:
+        L = estimate_path_length(g, samples=samples, precision=precision, seed=seed,
+                                 engine=engine)['L']
+    else:
+        L = average_path_length(g, engine=engine)
+    return C, L
+
+
+# Per-process sweep context, set up by _init_sweep_worker
+_SWEEP_CONTEXT: Optional[Dict] = None
+
+
+def _init_sweep_worker(context: Dict):
+    """Build the ring lattice once per process; jobs copy it."""
+    global _SWEEP_CONTEXT
+    _SWEEP_CONTEXT = dict(context, lattice=create_ring_lattice(context['n'], context['k']))
+
+
+def _sweep_job(job: Tuple[float, int]) -> Dict:
+    p, seed = job
+    ctx = _SWEEP_CONTEXT
+    started = time.monotonic()
+    g = watts_strogatz(ctx['n'], ctx['k'], p, seed=seed, lattice=ctx['lattice'])
+    C, L = _clustering_and_path_length(g, seed=seed, **ctx['options'])
+
+    record = {'p': p, 'seed': seed, 'C': C, 'L': L,
+              'C_over_C0': C / ctx['C0'] if ctx['C0'] else 0,
+              'L_over_L0': L / ctx['L0'] if ctx['L0'] else 0,
+              'gamma': None, 'lambda': None, 'sigma': None}
+    if ctx['C_random'] and ctx['L_random']:
+        record['gamma'] = C / ctx['C_random']
+        record['lambda'] = L / ctx['L_random']
+        record['sigma'] = record['gamma'] / record['lambda'] if record['lambda'] else 0
+    record['seconds'] = time.monotonic() - started
+    return record
+
+
+def _read_sweep_output(path: str) -> List[Tuple[float, int]]:
+    """
+    (p, seed) pairs already recorded in a sweep output file.
+
+    A partial last line, left by a sweep interrupted mid-write, is cut
+    off the file so the resumed sweep appends cleanly and reruns that
+    job; a malformed line anywhere else raises ValueError.
+    """
+    if not os.path.exists(path):
+        return []
+    is_csv = path.endswith('.csv')
+    header = None
+    done = []
+    offset = 0
+    bad = None
+    with open(path, 'rb') as f:
+        for number, raw in enumerate(f, 1):
+            if bad is not None:
+                raise ValueError(f"{path}:{bad[0]}: corrupt sweep record ({bad[2]})")
+            try:
+                if not raw.endswith(b'\n'):
+                    raise ValueError("line is incomplete")
+                text = raw.decode()
+                if not text.strip():
+                    pass
+                elif is_csv and header is None:
+                    header = next(csv.reader([text]))
+                    if 'p' not in header or 'seed' not in header:
+                        raise ValueError("header lacks 'p' and 'seed' columns")
+                else:
+                    if is_csv:
+                        fields = next(csv.reader([text]))
+                        if len(fields) != len(header):
+                            raise ValueError(f"expected {len(header)} columns, got {len(fields)}")
+                        row = dict(zip(header, fields))
+                    else:
+                        row = json.loads(text)
+                    done.append((float(row['p']), int(row['seed'])))
+            except (ValueError, KeyError, TypeError) as e:
+                bad = (number, offset, e)
+            offset += len(raw)
+
+    if bad is not None:
+        with open(path, 'r+b') as f:
+            f.truncate(bad[1])
+    return done
+
+
+def watts_strogatz_sweep(n: int, k: int, ps: List[float], seeds: List[int],
+                         workers: int = 1, output: Optional[str] = None,
+                         approximate: bool = False, samples: Optional[int] = None,
+                         precision: Optional[float] = None, engine: str = 'bfs',
+                         baseline_draws: int = 1, cache: Optional[BaselineCache] = None):
+    """
+    Reproduce the C(p)/C(0) and L(p)/L(0) curves over a grid of (p, seed).
+
+    The ring lattice is built once per process and its metrics C(0) and
+    L(0), like the random baseline used for σ, are computed once for the
+    whole sweep. Jobs run across `workers` processes and records are
+    yielded as they complete. With `output`, records are appended to a
+    CSV (.csv) or JSON-lines file and flushed one by one; (p, seed) pairs
+    already in the file are skipped, so an interrupted sweep resumes
+    where it stopped.
+
+    Yields:
+        One dict per (p, seed) with the fields in SWEEP_FIELDS
+    """
+    options = {'approximate': approximate, 'samples': samples,
+               'precision': precision, 'engine': engine}
+    done = set(_read_sweep_output(output)) if output else set()
+    jobs = [(p, seed) for p in ps for seed in seeds if (p, seed) not in done]
+    if not jobs:
+        return
+
+    C0, L0 = _clustering_and_path_length(create_ring_lattice(n, k), **options)
+    m = n * (k // 2)
+    baselines = random_baseline_ensemble(n, m, draws=baseline_draws, workers=workers,
+                                         cache=cache, compact=np is not None, **options)
+    context = {'n': n, 'k': k, 'C0': C0, 'L0': L0, 'options': options,
+               'C_random': mean(b['C_random'] for b in baselines),
+               'L_random': mean(b['L_random'] for b in baselines)}
+
+    out = None
+    writer = None
+    if output:
+        is_new = not os.path.exists(output) or os.path.getsize(output) == 0
+        out = open(output, 'a', newline='')
+        if output.endswith('.csv'):
+            writer = csv.DictWriter(out, fieldnames=SWEEP_FIELDS)
+            if is_new:
+                writer.writeheader()
+
+    def emit(record):
+        if out is not None:
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                out.write(json.dumps(record) + '\n')
+            out.flush()
+        return record
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(context,)) as pool:
+                for future in as_completed([pool.submit(_sweep_job, job) for job in jobs]):
+                    yield emit(future.result())
+        else:
+            _init_sweep_worker(context)
+            for job in jobs:
+                yield emit(_sweep_job(job))
+    finally:
+        if out is not None:
+            out.close()
+
+
+class ResultStore:
+    """
+    Content-addressed store of small-world metrics.
+
+    Results are filed under the SHA-256 of the graph file's bytes plus a
+    digest of the metric options, so an identical snapshot under any name
+    is analyzed only once per configuration.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def options_digest(options: Dict) -> str:
+        return hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _path(self, digest: str, options: Dict) -> str:
+        return os.path.join(self.directory, f"{digest}-{self.options_digest(options)}.json")
+
+    def get(self, digest: str, options: Dict) -> Optional[Dict]:
+        try:
+            with open(self._path(digest, options), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, digest: str, options: Dict, metrics: Dict):
+        path = self._path(digest, options)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(metrics, f)
+        os.replace(tmp, path)
+
+
+def file_digest(path: str, chunk_bytes: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def expand_graph_paths(pattern: str) -> List[str]:
+    """Files in a directory, or files matching a glob pattern, sorted by name."""
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p))
+
+
+# Failures of one batch file that are reported instead of stopping the batch
+BATCH_FILE_ERRORS = (OSError, ValueError, KeyError, IndexError, TypeError, EOFError)
+
+
+def _batch_job(job: Tuple[str, Dict]) -> Tuple[Dict, float]:
+    """Metrics of one graph file; load and analysis errors become {'error': ...}."""
+    path, options = job
+    started = time.monotonic()
+    try:
+        g = load_graph_file(path, weighted=bool(options.get('weighted')))
+        metrics = small_world_metrics(g, **options)
+    except BATCH_FILE_ERRORS as e:
+        metrics = {'error': f"{type(e).__name__}: {e}"}
+    return metrics, time.monotonic() - started
+
+
+def batch_analyze(paths: List[str], store: Optional[ResultStore] = None, workers: int = 1,
+                  cache: Optional[BaselineCache] = None, **options):
+    """
+    Small-world metrics for many graph files, skipping already-seen content.
+
+    Each file is hashed; results already in `store` for that content and
+    these options are reused, and files with identical content are
+    analyzed once. The remaining graphs run one per process, largest file
+    first so that long jobs start early and the pool packs well.
+
+    Args:
+        options: Passed to small_world_metrics (approximate, samples,
+            precision, time_budget, seed, engine, baseline_draws, weighted);
+            weighted=True also reads a third edge-list column as weights
+
+    Yields:
+        {'path', 'sha256', 'bytes', 'cached', 'seconds', 'metrics'} per
+        file; cached results first, then computed ones as they finish.
+        A file that cannot be read or analyzed gets 'metrics': None and
+        an 'error' message instead of stopping the batch; errors of
+        readable files are stored like results, so unchanged bad files
+        are not retried.
+    """
+    by_digest: Dict[str, List[str]] = {}
+    sizes = {}
+    for path in paths:
+        try:
+            digest = file_digest(path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            yield {'path': path, 'sha256': None, 'bytes': None, 'cached': False,
+                   'seconds': 0.0, 'metrics': None, 'error': f"{type(e).__name__}: {e}"}
+            continue
+        by_digest.setdefault(digest, []).append(path)
+        sizes[digest] = size
+
+    def records(digest, metrics, cached, seconds):
+        for path in by_digest[digest]:
+            record = {'path': path, 'sha256': digest, 'bytes': sizes[digest],
+                      'cached': cached, 'seconds': seconds, 'metrics': metrics}
+            if 'error' in metrics:
+                record.update(metrics=None, error=metrics['error'])
+            yield record
+
+    pending = []
+    for digest in by_digest:
+        metrics = store.get(digest, options) if store is not None else None
+        if metrics is not None:
+            yield from records(digest, metrics, True, 0.0)
+        else:
+            pending.append(digest)
+    pending.sort(key=lambda d: sizes[d], reverse=True)
+
+    def finish(digest, metrics, seconds):
+        if store is not None:
+            store.put(digest, options, metrics)
+        return records(digest, metrics, False, seconds)
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_batch_job, (by_digest[d][0], dict(options, cache=cache))): d
+                       for d in pending}
+            for future in as_completed(futures):
+                metrics, seconds = future.result()
+                yield from finish(futures[future], metrics, seconds)
+    else:
+        for digest in pending:
+            metrics, seconds = _batch_job((by_digest[digest][0],
+                                           dict(options, cache=cache, workers=workers)))
+            yield from finish(digest, metrics, seconds)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Small-World Network Metrics Calculator')
     parser.add_argument('--nodes', '-n', type=int, default=100, help='Number of nodes')
     parser.add_argument('--degree', '-k', type=int, default=6, help='Average degree')
     parser.add_argument('--rewire', '-p', type=float, default=0.1, help='Rewiring probability')
     parser.add_argument('--seed', type=int, help='Random seed')
-    parser.add_argument('--edgelist', type=str, help='Load graph from edge list CSV')
+    parser.add_argument('--edgelist', type=str,
+                        help='Load graph from edge list CSV or binary CSR file')
+    parser.add_argument('--save-graph', type=str,
+                        help='Write the loaded or generated graph as a binary CSR file')
+    parser.add_argument('--convert', action='store_true',
+                        help='Exit after --save-graph without calculating metrics')
+    parser.add_argument('--weighted', action='store_true',
+                        help='Read a third edge-list column as edge length (e.g. latency) and '
+                             'report weighted L and σ (needs NumPy)')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report per-phase time, memory and throughput; progress on stderr')
+    parser.add_argument('--sweep', action='store_true',
+                        help='Sweep rewiring probability over a log-spaced grid of p and seeds')
+    parser.add_argument('--p-min', type=float, default=1e-4, help='Smallest p in --sweep')
+    parser.add_argument('--p-max', type=float, default=1.0, help='Largest p in --sweep')
+    parser.add_argument('--sweep-points', type=int, default=14, help='Grid points in --sweep')
+    parser.add_argument('--sweep-seeds', type=int, default=1,
+                        help='Seeds per grid point in --sweep, counting up from --seed')
+    parser.add_argument('--batch', type=str,
+                        help='Analyze every graph file in a directory or matching a glob')
+    parser.add_argument('--store', type=str, default='.small_world_results',
+                        help='Content-addressed result store for --batch')
+    parser.add_argument('--output', '-o', type=str,
+                        help='Append --sweep records to this .csv or JSON-lines file (resumable), '
+                             'or write the --batch JSON-lines report')
+    parser.add_argument('--compact', action='store_true',
+                        help='Freeze graph into array-backed CSR storage (needs NumPy)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes for all-pairs path length (needs NumPy)')
+    parser.add_argument('--engine', choices=HOP_ENGINES, default='bfs',
+                        help='Hop-count engine: per-source BFS or bit-parallel multi-source BFS '
+                             '(--weighted adds weighted L via delta-stepping)')
+    parser.add_argument('--approx', action='store_true',
+                        help='Estimate L and L_random from sampled BFS pivots with error bars')
+    parser.add_argument('--samples', type=int, help='Maximum pivot sources per estimate')
+    parser.add_argument('--time-budget', type=float,
+                        help='Seconds to keep refining the estimates (implies --approx)')
+    parser.add_argument('--precision', type=float, default=0.01,
+                        help='Target relative CI half-width for --approx (default 0.01)')
+    parser.add_argument('--baselines', type=int, default=1,
+                        help='Number of random baseline graphs to average over')
+    parser.add_argument('--cache-dir', type=str,
+                        help='Directory for cached random-baseline results')
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='Maximum cached baselines before LRU eviction')
     
     args = parser.parse_args()
     
+    approximate = args.approx or args.time_budget is not None
+    if args.weighted and not (args.edgelist or args.batch):
+        parser.error("--weighted needs --edgelist or --batch")
+    # Binary graph files saved with weights are analyzed weighted by default
+    weighted = True if args.weighted else None
+    cache = BaselineCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+
+    if args.sweep:
+        ps = log_spaced(args.p_min, args.p_max, args.sweep_points)
+        first_seed = args.seed if args.seed is not None else 0
+        seeds = list(range(first_seed, first_seed + args.sweep_seeds))
+        records = watts_strogatz_sweep(
+            args.nodes, args.degree, ps, seeds, workers=args.workers, output=args.output,
+            approximate=approximate, samples=args.samples,
+            precision=args.precision if approximate else None, engine=args.engine,
+            baseline_draws=args.baselines, cache=cache)
+        for record in records:
+            if args.output:
+                print(f"p={record['p']:.3g} seed={record['seed']}: "
+                      f"C/C0={record['C_over_C0']:.4f} L/L0={record['L_over_L0']:.4f}")
+            else:
+                print(json.dumps(record), flush=True)
+        return
+
+    if args.batch:
+        paths = expand_graph_paths(args.batch)
+        records = batch_analyze(
+            paths, store=ResultStore(args.store), workers=args.workers, cache=cache,
+            approximate=approximate, samples=args.samples, time_budget=args.time_budget,
+            precision=args.precision if approximate else None, seed=args.seed,
+            engine=args.engine, baseline_draws=args.baselines, weighted=weighted)
+        out = open(args.output, 'w') if args.output else None
+        try:
+            for record in records:
+                line = json.dumps(record)
+                if out is not None:
+                    out.write(line + '\n')
+                    out.flush()
+                    status = 'cached' if record['cached'] else f"{record['seconds']:.1f}s"
+                    if record['metrics'] is None:
+                        print(f"{record['path']}: ✗ {record['error']} ({status})")
+                    else:
+                        print(f"{record['path']}: σ={record['metrics']['sigma']:.2f} ({status})")
+                else:
+                    print(line, flush=True)
+        finally:
+            if out is not None:
+                out.close()
+        return
+    
+    profiler = PhaseProfiler(progress=True) if args.profile else None
+
     if args.edgelist:
         # Load graph from file
-        g = Graph()
-        with open(args.edgelist, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split(',')
-                    if len(parts) >= 2:
-                        g.add_edge(int(parts[0]), int(parts[1]))
-        print(f"Loaded graph with {len(g.nodes())} nodes and {len(g.edges())} edges")
+        with phase(profiler, 'load', unit='edges') as p:
+            try:
+                g = load_graph_file(args.edgelist, weighted=args.weighted)
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            p.advance(g.number_of_edges())
+        print(f"Loaded graph with {g.number_of_nodes()} nodes and {g.number_of_edges()} edges")
     else:
         # Generate Watts-Strogatz graph
-        g = watts_strogatz(args.nodes, args.degree, args.rewire, args.seed)
+        with phase(profiler, 'generate', total=args.nodes, unit='nodes'):
+            g = watts_strogatz(args.nodes, args.degree, args.rewire, args.seed)
         print(f"Generated Watts-Strogatz graph: N={args.nodes}, k={args.degree}, p={args.rewire}")
     
+    if args.compact and not isinstance(g, CompactGraph):
+        g = g.freeze()
+        print(f"Compact storage: {g.nbytes / max(g.number_of_edges(), 1):.1f} bytes/edge")
+
+    if args.save_graph:
+        save_graph(g, args.save_graph)
+        print(f"Saved graph to {args.save_graph}")
+    if args.convert:
+        return
+
     print("\nCalculating metrics...")
-    metrics = small_world_metrics(g)
+    metrics = small_world_metrics(g, workers=args.workers, approximate=approximate,
+                                  samples=args.samples, time_budget=args.time_budget,
+                                  precision=args.precision if approximate else None,
+                                  seed=args.seed, engine=args.engine,
+                                  baseline_draws=args.baselines, cache=cache,
+                                  profiler=profiler, weighted=weighted)
+    if profiler is not None:
+        metrics['timings'] = profiler.report()
     
     if args.json:
         print(json.dumps(metrics, indent=2))
@@ -298,18 +2609,45 @@ def main():
         print(f"Average degree (k):           {metrics['k']:.2f}")
         print("-" * 60)
         print(f"Clustering coefficient (C):   {metrics['C']:.4f}")
+        print(f"Transitivity:                 {metrics['transitivity']:.4f}")
         print(f"Random graph C:               {metrics['C_random']:.4f}")
         print(f"γ = C/C_random:               {metrics['gamma']:.2f}")
         print("-" * 60)
-        print(f"Path length (L):              {metrics['L']:.4f}")
-        print(f"Random graph L:               {metrics['L_random']:.4f}")
+        if 'L_ci' in metrics:
+            print(f"Path length (L):              {metrics['L']:.4f} ± {metrics['L_ci']:.4f}"
+                  f" ({metrics['L_sources']} pivots)")
+            print(f"Random graph L:               {metrics['L_random']:.4f} ± {metrics['L_random_ci']:.4f}"
+                  f" ({metrics['L_random_sources']} pivots)")
+        else:
+            print(f"Path length (L):              {metrics['L']:.4f}")
+            print(f"Random graph L:               {metrics['L_random']:.4f}")
         print(f"λ = L/L_random:               {metrics['lambda']:.2f}")
         print(f"Expected SW L [log(N)/log(k)]: {metrics['L_expected_sw']:.4f}")
+        if metrics['unreachable_fraction'] > 0:
+            print(f"Unreachable node pairs:       {metrics['unreachable_fraction']:.2%}")
         print("-" * 60)
-        print(f"Small-world coefficient (σ):  {metrics['sigma']:.2f}")
+        if 'sigma_std' in metrics:
+            print(f"Small-world coefficient (σ):  {metrics['sigma']:.2f} ± {metrics['sigma_std']:.2f}"
+                  f" (sd over {metrics['baseline_draws']} baselines)")
+        else:
+            print(f"Small-world coefficient (σ):  {metrics['sigma']:.2f}")
         print(f"Is small-world:               {'YES' if metrics['is_small_world'] else 'NO'}")
+        if 'L_weighted' in metrics:
+            print("-" * 60)
+            if 'L_weighted_ci' in metrics:
+                print(f"Weighted path length:         {metrics['L_weighted']:.4f}"
+                      f" ± {metrics['L_weighted_ci']:.4f}")
+                print(f"Random graph weighted L:      {metrics['L_weighted_random']:.4f}"
+                      f" ± {metrics['L_weighted_random_ci']:.4f}")
+            else:
+                print(f"Weighted path length:         {metrics['L_weighted']:.4f}")
+                print(f"Random graph weighted L:      {metrics['L_weighted_random']:.4f}")
+            print(f"λ_w = L_w/L_w,random:         {metrics['lambda_weighted']:.2f}")
+            print(f"Weighted small-world (σ_w):   {metrics['sigma_weighted']:.2f}")
         print("=" * 60)
         print(f"\nInterpretation: {metrics['interpretation']}")
+        if profiler is not None:
+            print_phase_table(metrics['timings'])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Hourly Solar + Storage Dispatch Simulator
+
+Simulates a year (or several) of hourly PV generation, battery state of
+charge, round-trip and distribution losses, and derives the component
+outputs that eroei_calculator.create_example_solar_system() assumes as
+fixed percentages. Scenarios (PV size x battery size x ...) are
+simulated together, vectorized across the scenario axis.
+Part of the thermodynamic-economics skill for Univrs.io.
+
+Usage:
+    python solar_dispatch.py
+    python solar_dispatch.py --pv-kw 500,1000,2000 --battery-kwh 0,2000,4000,8000
+    python solar_dispatch.py --pv-kw 250:4000:16 --battery-kwh 0:16000:16 --years 3 --seed 1 -o grid.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from eroei_calculator import EnergyComponent, EnergySystem, EnergyType, parse_values
+from phase_profiler import PhaseProfiler, phase, print_phase_table
+
+HOURS_PER_YEAR = 8760
+
+# Per-unit costs scaled from create_example_solar_system (1 MW PV,
+# 4 MWh battery, local distribution)
+PV_EMBODIED_KWH_PER_KW = 1_500
+PV_OPERATING_KWH_PER_KW_YEAR = 10
+BATTERY_EMBODIED_KWH_PER_KWH = 200
+BATTERY_OPERATING_KWH_PER_KWH_YEAR = 1.25
+DISTRIBUTION_EMBODIED_KWH_PER_KW = 200
+DISTRIBUTION_OPERATING_KWH_PER_KW_YEAR = 2
+
+DISPATCH_FIELDS = ('pv_kw', 'battery_kwh', 'pv_generation_kwh_year', 'direct_use_kwh_year',
+                   'battery_charge_kwh_year', 'battery_discharge_kwh_year',
+                   'battery_losses_kwh_year', 'curtailed_kwh_year', 'delivered_kwh_year',
+                   'distribution_losses_kwh_year', 'unserved_kwh_year', 'equivalent_full_cycles',
+                   'self_sufficiency')
+
+
+def synthetic_pv_profile(capacity_factor: float = 0.17, latitude_deg: float = 40.0,
+                         years: int = 1, cloudiness: float = 0.3,
+                         seed: Optional[int] = None) -> np.ndarray:
+    """
+    Hourly PV output per kW of capacity.
+
+    A clear-sky sun-elevation curve for the latitude, times a random
+    daily cloud factor in [1 - cloudiness, 1], scaled so the mean is
+    `capacity_factor` (values are capped at 1).
+
+    Returns:
+        Array of 8760 * years hourly values in kW/kW
+    """
+    hours = np.arange(HOURS_PER_YEAR * years)
+    day = (hours // 24) % 365
+    declination = np.radians(23.44) * np.sin(2 * np.pi * (284 + day + 1) / 365)
+    hour_angle = np.radians(15 * (hours % 24 + 0.5 - 12))
+    latitude = np.radians(latitude_deg)
+    clear_sky = np.clip(np.sin(latitude) * np.sin(declination)
+                        + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle), 0, None)
+
+    if cloudiness > 0:
+        rng = np.random.default_rng(seed)
+        daily = 1 - cloudiness * rng.beta(2, 2, len(hours) // 24)
+        clear_sky = clear_sky * np.repeat(daily, 24)
+    return np.minimum(clear_sky * (capacity_factor / clear_sky.mean()), 1.0)
+
+
+def synthetic_load_profile(annual_kwh: float, years: int = 1) -> np.ndarray:
+    """
+    Hourly demand in kW with morning and evening peaks, averaging
+    annual_kwh / 8760.
+    """
+    hour = np.arange(HOURS_PER_YEAR * years) % 24 + 0.5
+    shape = (0.7 + 0.2 * np.exp(-((hour - 8) / 2) ** 2)
+             + 0.5 * np.exp(-((hour - 19) / 3) ** 2))
+    return shape * (annual_kwh / HOURS_PER_YEAR / shape.mean())
+
+
+def scenario_grid(pv_kw: List[float], battery_kwh: List[float]) -> Dict[str, np.ndarray]:
+    """Every (PV size, battery size) combination as flat scenario arrays."""
+    pv, battery = np.meshgrid(np.asarray(pv_kw, dtype=np.float64),
+                              np.asarray(battery_kwh, dtype=np.float64), indexing='ij')
+    return {'pv_kw': pv.ravel(), 'battery_kwh': battery.ravel()}
+
+
+def simulate_dispatch(pv_kw, battery_kwh, pv_profile, load_kw,
+                      battery_power_kw=None, round_trip_efficiency: float = 0.90,
+                      distribution_efficiency: float = 0.95, initial_soc: float = 0.5,
+                      profiler: Optional[PhaseProfiler] = None) -> Dict[str, np.ndarray]:
+    """
+    Hourly dispatch of PV and storage serving a load, for many scenarios.
+
+    Each hour PV first serves the load (grossed up for distribution
+    losses), surplus charges the battery up to its power and energy
+    limits and the rest is curtailed; a shortfall is discharged from the
+    battery, and whatever it cannot cover is unserved. Round-trip losses
+    are split evenly between charging and discharging. The hourly loop is
+    inherently sequential (state of charge), so each step is one array
+    operation over all scenarios.
+
+    Args:
+        pv_kw, battery_kwh: Scenario sizes, scalars or arrays of one length
+        pv_profile: kW per kW of PV, shape (hours,) or (scenarios, hours)
+        load_kw: Demand at the customer, shape (hours,) or (scenarios, hours)
+        battery_power_kw: Charge/discharge limit; defaults to a 4-hour
+            battery (battery_kwh / 4)
+        round_trip_efficiency: Battery energy out / energy in
+        distribution_efficiency: Energy delivered / energy sent
+        initial_soc: Starting state of charge as a fraction of capacity
+        profiler: Records the 'dispatch' phase, with progress in hours
+
+    Returns:
+        Dict of per-scenario arrays keyed by DISPATCH_FIELDS, energies in
+        kWh per year (averaged over the simulated years)
+    """
+    pv_kw, battery_kwh = np.broadcast_arrays(np.atleast_1d(np.asarray(pv_kw, dtype=np.float64)),
+                                             np.atleast_1d(np.asarray(battery_kwh, dtype=np.float64)))
+    scenarios = pv_kw.shape[0]
+    pv_profile = np.asarray(pv_profile, dtype=np.float64)
+    load_kw = np.asarray(load_kw, dtype=np.float64)
+    hours = pv_profile.shape[-1]
+    if load_kw.shape[-1] != hours:
+        raise ValueError(f"pv_profile has {hours} hours but load_kw has {load_kw.shape[-1]}")
+    power = battery_kwh / 4 if battery_power_kw is None else np.broadcast_to(
+        np.asarray(battery_power_kw, dtype=np.float64), (scenarios,))
+    efficiency = np.sqrt(round_trip_efficiency)
+
+    soc = battery_kwh * initial_soc
+    initial = soc.copy()
+    totals = {name: np.zeros(scenarios) for name in
+              ('pv', 'direct', 'charge', 'discharge', 'curtailed', 'unserved', 'load')}
+    # Scratch buffers reused every hour
+    generation = np.empty(scenarios)
+    need = np.empty(scenarios)
+    direct = np.empty(scenarios)
+    flow = np.empty(scenarios)
+    limit = np.empty(scenarios)
+
+    with phase(profiler, 'dispatch', total=hours, unit='hours') as p:
+        for t in range(hours):
+            np.multiply(pv_kw, pv_profile[..., t], out=generation)
+            np.divide(load_kw[..., t], distribution_efficiency, out=need)
+            np.minimum(generation, need, out=direct)
+            totals['pv'] += generation
+            totals['direct'] += direct
+            totals['load'] += load_kw[..., t]
+            generation -= direct  # surplus
+            need -= direct        # shortfall
+
+            # Charge from surplus, limited by power and headroom
+            np.subtract(battery_kwh, soc, out=limit)
+            limit /= efficiency
+            np.minimum(generation, power, out=flow)
+            np.minimum(flow, limit, out=flow)
+            soc += flow * efficiency
+            totals['charge'] += flow
+            generation -= flow
+            totals['curtailed'] += generation
+
+            # Discharge into the shortfall, limited by power and stored energy
+            np.multiply(soc, efficiency, out=limit)
+            np.minimum(need, power, out=flow)
+            np.minimum(flow, limit, out=flow)
+            soc -= flow / efficiency
+            totals['discharge'] += flow
+            need -= flow
+            totals['unserved'] += need
+            if t % 24 == 23:
+                p.advance(24)
+
+    years = hours / HOURS_PER_YEAR
+    sent = totals['direct'] + totals['discharge']
+    delivered = sent * distribution_efficiency
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cycles = np.where(battery_kwh > 0, totals['discharge'] / battery_kwh, 0.0) / years
+        self_sufficiency = np.where(totals['load'] > 0, delivered / totals['load'], 0.0)
+    return {
+        'pv_kw': pv_kw.copy(),
+        'battery_kwh': battery_kwh.copy(),
+        'pv_generation_kwh_year': totals['pv'] / years,
+        'direct_use_kwh_year': totals['direct'] / years,
+        'battery_charge_kwh_year': totals['charge'] / years,
+        'battery_discharge_kwh_year': totals['discharge'] / years,
+        'battery_losses_kwh_year': (totals['charge'] - totals['discharge'] - (soc - initial)) / years,
+        'curtailed_kwh_year': totals['curtailed'] / years,
+        'delivered_kwh_year': delivered / years,
+        'distribution_losses_kwh_year': (sent - delivered) / years,
+        'unserved_kwh_year': totals['unserved'] * distribution_efficiency / years,
+        'equivalent_full_cycles': cycles,
+        'self_sufficiency': self_sufficiency,
+    }
+
+
+def create_dispatched_solar_system(result: Dict[str, np.ndarray], index: int = 0,
+                                   round_trip_efficiency: float = 0.90,
+                                   distribution_efficiency: float = 0.95,
+                                   capacity_factor: float = 0.17) -> EnergySystem:
+    """
+    The solar + storage + distribution EnergySystem of one simulated
+    scenario, with outputs taken from the dispatch instead of fixed
+    percentages: PV output is generation net of curtailment, battery
+    output is energy discharged, distribution output is energy delivered.
+    """
+    pv_kw = float(result['pv_kw'][index])
+    battery_kwh = float(result['battery_kwh'][index])
+    curtailed = float(result['curtailed_kwh_year'][index])
+    system = EnergySystem(name=f"Solar PV {pv_kw:,.0f} kW with {battery_kwh:,.0f} kWh storage")
+
+    system.add_component(EnergyComponent(
+        name=f"Solar PV Array ({pv_kw:,.0f} kW)",
+        component_type=EnergyType.SOLAR_PV,
+        energy_output_kwh_year=float(result['pv_generation_kwh_year'][index]) - curtailed,
+        energy_input_kwh_year=pv_kw * PV_OPERATING_KWH_PER_KW_YEAR,
+        embodied_energy_kwh=pv_kw * PV_EMBODIED_KWH_PER_KW,
+        lifespan_years=25,
+        capacity_factor=capacity_factor,
+        notes=f"Hourly dispatch; {curtailed:,.0f} kWh/year curtailed"
+    ))
+    if battery_kwh > 0:
+        system.add_component(EnergyComponent(
+            name=f"Battery Storage ({battery_kwh:,.0f} kWh)",
+            component_type=EnergyType.BATTERY_STORAGE,
+            energy_output_kwh_year=float(result['battery_discharge_kwh_year'][index]),
+            energy_input_kwh_year=battery_kwh * BATTERY_OPERATING_KWH_PER_KWH_YEAR,
+            embodied_energy_kwh=battery_kwh * BATTERY_EMBODIED_KWH_PER_KWH,
+            lifespan_years=15,
+            efficiency=round_trip_efficiency,
+            notes=f"{float(result['equivalent_full_cycles'][index]):.0f} full cycles/year"
+        ))
+    system.add_component(EnergyComponent(
+        name="Distribution Network",
+        component_type=EnergyType.DISTRIBUTION,
+        energy_output_kwh_year=float(result['delivered_kwh_year'][index]),
+        energy_input_kwh_year=pv_kw * DISTRIBUTION_OPERATING_KWH_PER_KW_YEAR,
+        embodied_energy_kwh=pv_kw * DISTRIBUTION_EMBODIED_KWH_PER_KW,
+        lifespan_years=40,
+        efficiency=distribution_efficiency,
+        notes=f"{float(result['self_sufficiency'][index]):.1%} of demand served"
+    ))
+    return system
+
+
+def scenario_records(result: Dict[str, np.ndarray], **system_options) -> List[Dict]:
+    """One flat record per scenario: dispatch figures plus system EROEI."""
+    records = []
+    columns = {name: result[name].tolist() for name in DISPATCH_FIELDS}
+    for i in range(len(result['pv_kw'])):
+        record = {name: columns[name][i] for name in DISPATCH_FIELDS}
+        system = create_dispatched_solar_system(result, i, **system_options)
+        record['system_eroei'] = system.system_eroei
+        record['net_energy_kwh_year'] = system.net_energy
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hourly Solar + Storage Dispatch Simulator')
+    parser.add_argument('--pv-kw', type=str, default='1000',
+                        help="PV sizes in kW: 'a,b,c', 'start:stop:points' or 'start:stop:points:log'")
+    parser.add_argument('--battery-kwh', type=str, default='4000',
+                        help="Battery sizes in kWh, same format")
+    parser.add_argument('--annual-load', type=float, default=1_282_500,
+                        help='Annual demand at the customer in kWh (default matches the example system)')
+    parser.add_argument('--capacity-factor', type=float, default=0.17, help='Mean PV capacity factor')
+    parser.add_argument('--latitude', type=float, default=40.0, help='Site latitude in degrees')
+    parser.add_argument('--cloudiness', type=float, default=0.3,
+                        help='Largest daily fractional reduction from clouds (0 = clear sky)')
+    parser.add_argument('--years', type=int, default=1, help='Simulated years')
+    parser.add_argument('--seed', type=int, help='Random seed for the weather')
+    parser.add_argument('--round-trip', type=float, default=0.90, help='Battery round-trip efficiency')
+    parser.add_argument('--distribution', type=float, default=0.95, help='Distribution efficiency')
+    parser.add_argument('--output', '-o', type=str, help='Write scenario table as .csv or JSON lines')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report per-phase time, memory and throughput; progress on stderr')
+
+    args = parser.parse_args()
+    profiler = PhaseProfiler(progress=True) if args.profile else None
+
+    grid = scenario_grid(parse_values(args.pv_kw), parse_values(args.battery_kwh))
+    pv_profile = synthetic_pv_profile(args.capacity_factor, args.latitude, args.years,
+                                      args.cloudiness, args.seed)
+    load = synthetic_load_profile(args.annual_load, args.years)
+    result = simulate_dispatch(grid['pv_kw'], grid['battery_kwh'], pv_profile, load,
+                               round_trip_efficiency=args.round_trip,
+                               distribution_efficiency=args.distribution, profiler=profiler)
+    with phase(profiler, 'systems', total=len(grid['pv_kw']), unit='scenarios'):
+        records = scenario_records(result, round_trip_efficiency=args.round_trip,
+                                   distribution_efficiency=args.distribution,
+                                   capacity_factor=args.capacity_factor)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            if args.output.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=list(records[0]))
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+        print(f"Wrote {len(records)} scenarios to {args.output}", file=sys.stderr)
+    elif args.json:
+        print(json.dumps(records, indent=2))
+    else:
+        print("\n" + "=" * 70)
+        print(f"SOLAR + STORAGE DISPATCH ({args.years} year(s), {len(records)} scenarios)")
+        print("=" * 70)
+        print(f"{'PV kW':>8} {'Batt kWh':>9} {'PV MWh':>9} {'Curtail':>8} {'Cycles':>7} "
+              f"{'Served':>7} {'EROEI':>7}")
+        for r in records:
+            print(f"{r['pv_kw']:>8,.0f} {r['battery_kwh']:>9,.0f} "
+                  f"{r['pv_generation_kwh_year'] / 1000:>9,.0f} "
+                  f"{r['curtailed_kwh_year'] / max(r['pv_generation_kwh_year'], 1):>8.1%} "
+                  f"{r['equivalent_full_cycles']:>7.0f} {r['self_sufficiency']:>7.1%} "
+                  f"{r['system_eroei']:>7.2f}")
+    if profiler is not None:
+        print_phase_table(profiler.report(), stream=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()